@@ -576,7 +576,7 @@ class Client:
         )
 
         stub = collection_pb2_grpc.CollectionStub(channel)
-        request = collection_pb2.GetRequest(id=id)
+        request = collection_pb2.GetRequest(id=id, include_media=True)
 
         response = stub.get(request)
 
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import aiohttp
 import requests
 from typing import Any, Dict, List, Optional
 from ray import serve
@@ -6,37 +8,154 @@ import ray
 import os
 from ray.serve import Application
 from pathlib import Path
+from concurrent import futures
 from analyser.plugins.compute_plugin import ComputePlugin, ComputePluginManager
 from analyser.inference import InferenceServer, InferenceServerFactory
 from google.protobuf.json_format import MessageToDict, ParseDict, Parse
 
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
 
 @serve.deployment
 class Deployment:
-    def __init__(self, plugin: ComputePlugin) -> None:
+    def __init__(
+        self,
+        plugin: ComputePlugin,
+        max_batch_size: int = None,
+        batch_wait_timeout_ms: float = None,
+    ) -> None:
         self.plugin = plugin
+        # the plugin runs outside of the event loop, so the replica can collect the
+        # next batch meanwhile, a single thread keeps the plugin calls sequential
+        self.executor = futures.ThreadPoolExecutor(max_workers=1)
 
-    async def __call__(self, request) -> Dict[str, str]:
-        data = await request.json()
+        self.batching = max_batch_size is not None and max_batch_size > 1
+        if self.batching:
+            self.batched_call.set_max_batch_size(max_batch_size)
+            if batch_wait_timeout_ms is not None:
+                self.batched_call.set_batch_wait_timeout_s(batch_wait_timeout_ms / 1000)
+
+    async def run_plugin(self, analyse_request):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.plugin, analyse_request)
+
+    @serve.batch
+    async def batched_call(self, analyse_requests: List) -> List:
+        from interface.common_pb2 import PluginRun
+
+        # requests are only merged if they use the same parameters
+        groups = {}
+        for i, analyse_request in enumerate(analyse_requests):
+            key = b"".join(x.SerializeToString() for x in analyse_request.parameters)
+            groups.setdefault(key, [])
+            groups[key].append(i)
+
+        results = [None] * len(analyse_requests)
+        for indexes in groups.values():
+            batch_request = PluginRun(
+                plugin=analyse_requests[indexes[0]].plugin,
+                parameters=analyse_requests[indexes[0]].parameters,
+            )
+            for i in indexes:
+                batch_request.inputs.extend(analyse_requests[i].inputs)
+
+            batch_results = await self.run_plugin(batch_request)
+
+            # plugins without one result per input can't be split again
+            if batch_results is None or len(batch_results.results) != len(
+                batch_request.inputs
+            ):
+                logging.warning(
+                    f"[Deployment] Plugin {self.plugin.instance_name} can't be batched"
+                )
+                for i in indexes:
+                    results[i] = await self.run_plugin(analyse_requests[i])
+                continue
+
+            offset = 0
+            for i in indexes:
+                num_inputs = len(analyse_requests[i].inputs)
+                results[i] = type(batch_results)(
+                    results=batch_results.results[offset : offset + num_inputs]
+                )
+                offset += num_inputs
 
+        return results
+
+    async def __call__(self, request) -> Dict[str, str]:
         from interface.common_pb2 import PluginRun
 
-        analyse_request = ParseDict(data["inputs"], PluginRun())
+        protobuf = request.headers.get("content-type") == PROTOBUF_CONTENT_TYPE
+        if protobuf:
+            analyse_request = PluginRun()
+            analyse_request.ParseFromString(await request.body())
+        else:
+            data = await request.json()
+            analyse_request = ParseDict(data["inputs"], PluginRun())
 
-        results = self.plugin(analyse_request)
+        if self.batching:
+            results = await self.batched_call(analyse_request)
+        else:
+            results = await self.run_plugin(analyse_request)
+
+        if protobuf:
+            from starlette.responses import Response
+
+            return Response(
+                content=results.SerializeToString(), media_type=PROTOBUF_CONTENT_TYPE
+            )
 
         return MessageToDict(results)
 
 
 def app_builder(args) -> Application:
     logging.warning(args)
-    return Deployment.options(**args["options"]).bind(args["plugin"])
+    return Deployment.options(**args["options"]).bind(
+        args["plugin"], **args.get("batching", {})
+    )
+
+
+default_config = {
+    "url": "http://localhost:8000",
+    "transport": "protobuf",
+    "pool_size": 16,
+    "async_pool_size": 256,
+    "timeout": 120,
+}
 
 
 @InferenceServerFactory.export("RayInferenceServer")
-class RayInferenceServer(InferenceServer):
+class RayInferenceServer(InferenceServer, config=default_config):
     def __init__(self, config: Dict) -> None:
         super().__init__(config)
+        self.url = self.config.get("url")
+        self.transport = self.config.get("transport")
+        self.pool_size = self.config.get("pool_size")
+        self.timeout = self.config.get("timeout")
+        self.session = None
+        self.async_pool_size = self.config.get("async_pool_size")
+        self.async_session = None
+
+    def get_session(self) -> requests.Session:
+        # one session with a connection pool is shared by all threads
+        if self.session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.pool_size, pool_maxsize=self.pool_size
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.session = session
+        return self.session
+
+    def get_async_session(self) -> aiohttp.ClientSession:
+        # created on first use inside the event loop of the aio server
+        if self.async_session is None:
+            self.async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.async_pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.async_session
 
     def start(
         self,
@@ -80,6 +199,11 @@ class RayInferenceServer(InferenceServer):
             else:
                 requirements = list()
 
+            batching = {
+                "max_batch_size": inference_config.get("max_batch_size"),
+                "batch_wait_timeout_ms": inference_config.get("batch_wait_timeout_ms"),
+            }
+
             # Construct the isolated environment specification
             runtime_env = {
                 "uv": requirements,
@@ -92,6 +216,7 @@ class RayInferenceServer(InferenceServer):
                 app_builder(
                     {
                         "plugin": compute_plugin,
+                        "batching": batching,
                         "options": {
                             "name": plugin_instance_name,
                             "ray_actor_options": {"runtime_env": runtime_env},
@@ -122,13 +247,19 @@ class RayInferenceServer(InferenceServer):
         # if not found:
         #     logging.error(f"{plugin} not found")
         #     return None
-        logging.info(f"http://localhost:8000/{plugin_instance_name}")
+        url = f"{self.url}/{plugin_instance_name}"
+        logging.info(url)
+
+        if self.transport == "protobuf":
+            return self.call_protobuf(url, request)
+
         try:
-            response = requests.post(
-                f"http://localhost:8000/{plugin_instance_name}",
+            response = self.get_session().post(
+                url,
                 json={
                     "inputs": MessageToDict(request),
                 },
+                timeout=self.timeout,
             )
         except Exception as e:
             logging.error(f"{e}")
@@ -148,3 +279,62 @@ class RayInferenceServer(InferenceServer):
         except Exception as e:
             logging.error(f"{response} {e}")
             return None
+
+    def call_protobuf(self, url, request):
+        from interface import analyser_pb2
+
+        try:
+            response = self.get_session().post(
+                url,
+                data=request.SerializeToString(),
+                headers={
+                    "Content-Type": PROTOBUF_CONTENT_TYPE,
+                    "Accept": PROTOBUF_CONTENT_TYPE,
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logging.error(f"{e}")
+            return None
+
+        try:
+            result = analyser_pb2.AnalyseReply()
+            result.ParseFromString(response.content)
+            return result
+        except Exception as e:
+            logging.error(f"{response} {e}")
+            return None
+
+    async def call_async(self, compute_plugin, request):
+        from interface import analyser_pb2
+
+        url = f"{self.url}/{compute_plugin.instance_name}"
+        logging.info(url)
+
+        try:
+            if self.transport == "protobuf":
+                async with self.get_async_session().post(
+                    url,
+                    data=request.SerializeToString(),
+                    headers={
+                        "Content-Type": PROTOBUF_CONTENT_TYPE,
+                        "Accept": PROTOBUF_CONTENT_TYPE,
+                    },
+                ) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+
+                result = analyser_pb2.AnalyseReply()
+                result.ParseFromString(content)
+                return result
+
+            async with self.get_async_session().post(
+                url, json={"inputs": MessageToDict(request)}
+            ) as response:
+                response_dict = await response.json()
+
+            return ParseDict(response_dict, analyser_pb2.AnalyseReply())
+        except Exception as e:
+            logging.error(f"{url} {e}")
+            return None
@@ -1,9 +1,15 @@
 from typing import Dict
+import asyncio
 import logging
+import hashlib
+import json
 import os
 
 from analyser.utils.plugin import Plugin
 from analyser.utils.plugin import Factory
+from analyser.utils.cache import CacheManager, get_hash_for_plugin
+
+from interface import analyser_pb2, common_pb2, data_pb2
 
 
 class InferenceServer(Plugin):
@@ -13,6 +19,10 @@ class InferenceServer(Plugin):
     def start(self) -> None:
         pass
 
+    async def call_async(self, compute_plugin, request):
+        # servers without an async client block a worker thread of the event loop
+        return await asyncio.to_thread(self, compute_plugin, request)
+
 
 class InferenceServerFactory(
     Factory,
@@ -67,6 +77,22 @@ class InferenceServerManager:
                 "compute_plugins": [],
             }
 
+        # Content addressed cache for the results of compute plugins
+        self.embedding_cache = None
+        embedding_cache_config = self.config.get("embedding_cache")
+        if embedding_cache_config is not None:
+            self.embedding_cache = CacheManager.build(
+                name=embedding_cache_config.get("type"),
+                config=embedding_cache_config.get("params", {}),
+            )
+
+    def __getstate__(self):
+        # compute plugins are pickled with a reference to this manager for the
+        # inference servers, the cache holds open connections and stays here
+        state = self.__dict__.copy()
+        state["embedding_cache"] = None
+        return state
+
     def register_compute_plugin(
         self, inference_server_name: str, compute_plugin: "ComputePlugin"
     ):
@@ -84,7 +110,7 @@ class InferenceServerManager:
                 inference_server_entry["compute_plugins"]
             )
 
-    def __call__(
+    def run(
         self,
         compute_plugin_manager: "ComputePluginManager",
         compute_plugin_name: str,
@@ -99,3 +125,165 @@ class InferenceServerManager:
         return self.inference_servers[inference_server_name]["inference_server"](
             compute_plugin["compute_plugin"], **kwargs
         )
+
+    async def run_async(
+        self,
+        compute_plugin_manager: "ComputePluginManager",
+        compute_plugin_name: str,
+        request: common_pb2.PluginRun = None,
+    ):
+        compute_plugin = compute_plugin_manager[compute_plugin_name]
+        inference_server_name = compute_plugin["inference_server_name"]
+        if inference_server_name is None:
+            # local plugins are CPU bound and must not block the event loop
+            return await asyncio.to_thread(
+                compute_plugin["compute_plugin"], request=request
+            )
+
+        return await self.inference_servers[inference_server_name][
+            "inference_server"
+        ].call_async(compute_plugin["compute_plugin"], request)
+
+    def get_cache_keys(
+        self, compute_plugin: "ComputePlugin", request: common_pb2.PluginRun
+    ):
+        parameters = [
+            x.SerializeToString(deterministic=True).hex() for x in request.parameters
+        ]
+        # the model or checkpoint in the config can change without a version bump
+        config_hash = hashlib.sha256(
+            json.dumps(compute_plugin.config, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        keys = []
+        for input in request.inputs:
+            # the id of the input is random, only the content is relevant
+            content = data_pb2.Data()
+            content.CopyFrom(input)
+            content.id = ""
+            content_hash = hashlib.sha256(
+                content.SerializeToString(deterministic=True)
+            ).hexdigest()
+
+            keys.append(
+                get_hash_for_plugin(
+                    plugin=compute_plugin.instance_name,
+                    output="",
+                    version=compute_plugin.version(),
+                    parameters=parameters,
+                    inputs=[content_hash],
+                    config={"hash": config_hash},
+                )
+            )
+        return keys
+
+    def cached_calls(
+        self,
+        compute_plugin_manager: "ComputePluginManager",
+        compute_plugin_name: str,
+        request: common_pb2.PluginRun = None,
+    ):
+        """Generator with the steps of a cached plugin call shared by __call__ and
+        call_async.
+
+        It yields ("get", keys), ("run", request) and ("set", [(key, value)]) steps,
+        receives their results and returns the reply, so only the calls of the
+        inference server and the cache differ between both.
+        """
+        compute_plugin = compute_plugin_manager[compute_plugin_name]
+        if (
+            self.embedding_cache is None
+            or request is None
+            or not compute_plugin["config"].get("cache", False)
+        ):
+            return (yield "run", request)
+
+        keys = self.get_cache_keys(compute_plugin["compute_plugin"], request)
+
+        cached = yield "get", keys
+        results = [
+            None if x is None else common_pb2.PluginResult.FromString(x) for x in cached
+        ]
+
+        missing = [i for i, x in enumerate(results) if x is None]
+        logging.info(
+            f"[InferenceServerManager] {compute_plugin_name}: {len(keys) - len(missing)} cached, {len(missing)} missing"
+        )
+
+        if len(missing) > 0:
+            missing_request = common_pb2.PluginRun(
+                plugin=request.plugin,
+                parameters=request.parameters,
+                inputs=[request.inputs[i] for i in missing],
+            )
+
+            missing_results = yield "run", missing_request
+            if missing_results is None:
+                return None
+
+            # only plugins with one result per input can be cached
+            if len(missing_results.results) != len(missing):
+                logging.warning(
+                    f"[InferenceServerManager] Results of {compute_plugin_name} can't be cached"
+                )
+                return (yield "run", request)
+
+            for i, result in zip(missing, missing_results.results):
+                results[i] = result
+
+            yield "set", [(keys[i], results[i].SerializeToString()) for i in missing]
+
+        return analyser_pb2.AnalyseReply(results=results)
+
+    def __call__(
+        self,
+        compute_plugin_manager: "ComputePluginManager",
+        compute_plugin_name: str,
+        request: common_pb2.PluginRun = None,
+        **kwargs,
+    ):
+        calls = self.cached_calls(compute_plugin_manager, compute_plugin_name, request)
+        try:
+            step, arg = next(calls)
+            while True:
+                if step == "run":
+                    response = self.run(
+                        compute_plugin_manager,
+                        compute_plugin_name,
+                        request=arg,
+                        **kwargs,
+                    )
+                elif step == "get":
+                    response = [self.embedding_cache.get(x) for x in arg]
+                else:
+                    response = [self.embedding_cache.set(*x) for x in arg]
+                step, arg = calls.send(response)
+        except StopIteration as e:
+            return e.value
+
+    async def call_async(
+        self,
+        compute_plugin_manager: "ComputePluginManager",
+        compute_plugin_name: str,
+        request: common_pb2.PluginRun = None,
+    ):
+        """Same as __call__ but awaits the inference server and the cache"""
+        calls = self.cached_calls(compute_plugin_manager, compute_plugin_name, request)
+        try:
+            step, arg = next(calls)
+            while True:
+                if step == "run":
+                    response = await self.run_async(
+                        compute_plugin_manager, compute_plugin_name, request=arg
+                    )
+                elif step == "get":
+                    response = await asyncio.gather(
+                        *[self.embedding_cache.get_async(x) for x in arg]
+                    )
+                else:
+                    response = await asyncio.gather(
+                        *[self.embedding_cache.set_async(*x) for x in arg]
+                    )
+                step, arg = calls.send(response)
+        except StopIteration as e:
+            return e.value
@@ -0,0 +1,170 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent import futures
+from fnmatch import fnmatch
+from typing import Dict, List, Tuple
+
+from interface import data_pb2
+
+from data import DataManager
+
+default_config = {"num_workers": 8, "cache_size_mb": 256}
+
+
+class DataProtoCache:
+    """LRU cache of the converted data of a point, limited by the size of the protos"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.num_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Dict | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Tuple, entry: Dict) -> None:
+        # entries are never modified, a new entry replaces the old one
+        size = sum(x.ByteSize() for x in entry["data"].values())
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            old_entry = self.entries.pop(key, None)
+            if old_entry is not None:
+                self.num_bytes -= old_entry["size"]
+
+            self.entries[key] = {**entry, "size": size}
+            self.num_bytes += size
+
+            while self.num_bytes > self.max_bytes:
+                _, old_entry = self.entries.popitem(last=False)
+                self.num_bytes -= old_entry["size"]
+
+    def invalidate(self, point_id: str) -> None:
+        # a point has one entry for each combination of the media options
+        with self.lock:
+            for include_media in (False, True):
+                for include_thumbnail in (False, True):
+                    old_entry = self.entries.pop(
+                        (point_id, include_media, include_thumbnail), None
+                    )
+                    if old_entry is not None:
+                        self.num_bytes -= old_entry["size"]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.num_bytes = 0
+
+
+class ResultHydrator:
+    def __init__(self, data_manager: DataManager, config: Dict = None):
+        self.data_manager = data_manager
+        self.config = {**default_config, **(config or {})}
+
+        self.pool = futures.ThreadPoolExecutor(
+            max_workers=self.config.get("num_workers")
+        )
+        self.cache = DataProtoCache(self.config.get("cache_size_mb") * 1024 * 1024)
+
+    def __call__(
+        self,
+        point_ids: List[str],
+        include_fields: List[str] = None,
+        exclude: List[set] = None,
+        include_media: bool = False,
+        include_thumbnail: bool = False,
+    ) -> List[List[Tuple[str, data_pb2.Data]]]:
+        """Returns the (name, data) pairs of all points in the order of point_ids.
+
+        Fields that are not included or listed in exclude (e.g. because they are
+        already part of the search payload) are never decoded. Images contain
+        the encoded image only if include_media is set.
+        """
+        if exclude is None:
+            exclude = [set()] * len(point_ids)
+
+        media_options = {
+            "include_media": include_media,
+            "include_thumbnail": include_thumbnail,
+        }
+
+        return list(
+            self.pool.map(
+                lambda x: self.load_point(x[0], include_fields, x[1], media_options),
+                zip(point_ids, exclude),
+            )
+        )
+
+    def invalidate(self, point_ids: List[str]) -> None:
+        """Drops the cached data of points that are replaced or deleted"""
+        for point_id in point_ids:
+            self.cache.invalidate(point_id)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def is_included(self, name, include_fields):
+        if not include_fields:
+            return True
+        return any(fnmatch(name, x) for x in include_fields)
+
+    def load_point(self, point_id, include_fields, exclude, media_options):
+        # images differ between the media options, so they are cached separately
+        cache_key = (
+            point_id,
+            media_options["include_media"],
+            media_options["include_thumbnail"],
+        )
+        entry = self.cache.get(cache_key)
+
+        if entry is not None:
+            names = [
+                x
+                for x in entry["names"]
+                if x not in exclude and self.is_included(x, include_fields)
+            ]
+            if all(x in entry["data"] for x in names):
+                return [(x, entry["data"][x]) for x in names]
+
+        cached_data = {} if entry is None else entry["data"]
+
+        data_list = self.data_manager.load(point_id)
+        if data_list is None:
+            return []
+
+        names = []
+        results = []
+        new_data = {}
+        with data_list:
+            for name, data in data_list:
+                names.append(name)
+                if name in exclude or not self.is_included(name, include_fields):
+                    continue
+
+                if name in cached_data:
+                    results.append((name, cached_data[name]))
+                    continue
+
+                try:
+                    with data as data:
+                        if data.type == "ImageData":
+                            new_data[name] = data.to_proto(**media_options)
+                        else:
+                            new_data[name] = data.to_proto()
+                except Exception as e:
+                    logging.error(
+                        f"[ResultHydrator::load_point] {point_id}/{name}: {repr(e)}"
+                    )
+                    continue
+                results.append((name, new_data[name]))
+
+        self.cache.set(cache_key, {"names": names, "data": {**cached_data, **new_data}})
+
+        return results
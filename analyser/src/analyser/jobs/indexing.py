@@ -9,8 +9,9 @@ from analyser.utils import image_normalize
 from interface import analyser_pb2, common_pb2, data_pb2
 from fnmatch import fnmatch
 
-from typing import Dict
+from typing import Dict, List
 from analyser.shared_object import SharedObject
+from analyser.plugins.indexer_plugin import UpsertBatcher
 
 
 class IndexingJob:
@@ -20,6 +21,126 @@ class IndexingJob:
             config = {}
         self.config = config
 
+        # number of points that are collected before the inputs are send to the
+        # compute plugins
+        self.batch_size = self.config.get("batch_size", 64)
+
+    def collect_point(self, point_id, indexing_plugin_mappings, payload_mapping):
+        with self.shared_object.data_manager.load(point_id) as point:
+            data_dict = {}
+            scalar_dict = {}
+            for name, data in point:
+                with data as data:
+                    if data.type in ("BoolData", "FloatData", "IntData"):
+                        data_dict.update({name: data.to_proto()})
+                    if data.type in ("TextData"):
+                        data_dict.update({name: data.to_proto()})
+                    if data.type in ("ImageData"):
+                        data_dict.update({name: data.to_proto()})
+                    if data.type in ("GeoData"):
+                        data_dict.update({name: data.to_proto()})
+
+                    if hasattr(data, "to_scalar"):
+                        scalar_dict.update({name: data.to_scalar()})
+
+            # extrect payload fields
+            meta_dict = {}
+            for field in payload_mapping.fields:
+                for name, data in scalar_dict.items():
+                    if fnmatch(name, field):
+                        meta_dict[name] = data
+
+            # map (name, data) list to the (index, plugin)
+            plugin_inputs = []
+            for indexing_plugin_mapping in indexing_plugin_mappings:
+                for field in indexing_plugin_mapping.fields:
+                    for name, data in data_dict.items():
+                        if fnmatch(name, field):
+                            plugin_input = data_pb2.Data()
+                            plugin_input.CopyFrom(data)
+
+                            for k, v in indexing_plugin_mapping.input_mapping.items():
+                                if fnmatch(name, k):
+                                    plugin_input.name = v
+
+                            plugin_inputs.append(
+                                {
+                                    "index_name": indexing_plugin_mapping.index_name,
+                                    "compute_plugin": indexing_plugin_mapping.compute_plugin,
+                                    "data": plugin_input,
+                                }
+                            )
+
+            return {
+                "id": point.id,
+                "meta": meta_dict,
+                "plugin_inputs": plugin_inputs,
+                "features": {},
+                "feature_index": {},
+            }
+
+    def compute_batch(self, points: List[Dict]):
+        # group all inputs of this batch by compute plugin, so that every plugin is
+        # called only once with all inputs
+        plugin_groups = {}
+        for point in points:
+            for plugin_input in point["plugin_inputs"]:
+                plugin_groups.setdefault(plugin_input["compute_plugin"], [])
+                plugin_groups[plugin_input["compute_plugin"]].append(
+                    (point, plugin_input)
+                )
+
+        for compute_plugin, entries in plugin_groups.items():
+            request = common_pb2.PluginRun(
+                plugin=compute_plugin,
+                inputs=[plugin_input["data"] for _, plugin_input in entries],
+            )
+
+            results = self.shared_object.inference_server_manager(
+                self.shared_object.compute_plugin_manager,
+                compute_plugin_name=compute_plugin,
+                request=request,
+            )
+
+            if not results or len(results.results) <= 0:
+                logging.warning(f"No outputs from plugin ({compute_plugin})")
+                continue
+
+            if len(results.results) != len(entries):
+                logging.error(
+                    f"[IndexingJob] Plugin '{compute_plugin}' returned {len(results.results)} results for {len(entries)} inputs"
+                )
+                continue
+
+            # scatter the results back to the points
+            for (point, plugin_input), result in zip(entries, results.results):
+                index_name = plugin_input["index_name"]
+
+                self.shared_object.collection_database.add_data_to_point(
+                    point["id"],
+                    analyser_pb2.AnalyseReply(results=[result]),
+                    name=index_name,
+                )
+
+                # TODO multivector plugins
+                feature_vecs = list(result.result.feature.feature)
+                point["features"].setdefault(index_name, [])
+                point["features"][index_name].append(feature_vecs)
+
+                point["feature_index"].setdefault(
+                    "_feature_data_index/" + index_name, []
+                )
+                point["feature_index"]["_feature_data_index/" + index_name].append(
+                    plugin_input["data"].id
+                )
+
+    def index_point(self, point: Dict) -> Dict:
+        return {
+            "id": point["id"],
+            "meta": {**point["meta"], **point["feature_index"]},
+            "features": point["features"],
+        }
+
     def __call__(self, args):
         # TODO customize the indexing path and plugin behind it
         logging.error(args)
@@ -38,100 +159,34 @@ class IndexingJob:
 
         payload_mapping = collection_manager.get_payload_mapping(collection_name)
 
+        # points are upserted in batches by the batcher, independent of batch_size
+        upsert_batcher = UpsertBatcher(
+            collection_manager, "default", config=self.config.get("upsert")
+        )
+
         try:
-            for i, point in enumerate(args["points_list"]):
-                with self.shared_object.data_manager.load(point) as point:
-                    logging.info(f"{i} {point.id}")
-
-                    data_dict = {}
-                    scalar_dict = {}
-                    for name, data in point:
-                        with data as data:
-                            if data.type in ("BoolData", "FloatData", "IntData"):
-                                data_dict.update({name: data.to_proto()})
-                            if data.type in ("TextData"):
-                                data_dict.update({name: data.to_proto()})
-                            if data.type in ("ImageData"):
-                                data_dict.update({name: data.to_proto()})
-                            if data.type in ("GeoData"):
-                                data_dict.update({name: data.to_proto()})
-
-                            if hasattr(data, "to_scalar"):
-                                scalar_dict.update({name: data.to_scalar()})
-
-                    # extrect payload fields
-                    meta_dict = {}
-                    for field in payload_mapping.fields:
-                        for name, data in scalar_dict.items():
-                            if fnmatch(name, field):
-                                meta_dict[name] = data
-
-                    # map (name, data) list to the (index, plugin)
-                    data_plugin_mapping = []
-                    for indexing_plugin_mapping in indexing_plugin_mappings:
-                        for field in indexing_plugin_mapping.fields:
-                            for name, data in data_dict.items():
-                                if fnmatch(name, field):
-                                    data_plugin_mapping.append(
-                                        (indexing_plugin_mapping, name, data)
-                                    )
-
-                    feature_dict = {}
-                    feature_index_dict = {}
-                    for data_plugin in data_plugin_mapping:
-                        data = data_plugin[2]
-
-                        index_name = data_plugin[0].index_name
-                        feature_dict.setdefault(index_name, [])
-                        feature_index_dict.setdefault(
-                            "_feature_data_index/" + index_name, []
-                        )
-
-                        for k, v in data_plugin[0].input_mapping.items():
-                            if fnmatch(data_plugin[1], k):
-                                data.name = v
-
-                        request = common_pb2.PluginRun(
-                            plugin=data_plugin[0].compute_plugin,
-                            inputs=[data],
-                        )
-
-                        results = self.shared_object.inference_server_manager(
-                            self.shared_object.compute_plugin_manager,
-                            compute_plugin_name=data_plugin[0].compute_plugin,
-                            request=request,
-                        )
-
-                        if not results or len(results.results) <= 0:
-                            logging.warning(f"No outputs from plugin ({data_plugin})")
-                            continue
-
-                        self.shared_object.collection_database.add_data_to_point(
-                            point.id, results, name=index_name
-                        )
-
-                        # TODO multivector plugins
-                        feature_vecs = list(results.results[0].result.feature.feature)
-                        feature_dict[index_name].append(feature_vecs)
-
-                        feature_index_dict["_feature_data_index/" + index_name].append(
-                            data.id
-                        )
-
-                    collection_manager.add_points(
-                        collection_name="default",
-                        points=[
-                            {
-                                "id": point.id,
-                                "meta": {**meta_dict, **feature_index_dict},
-                                "features": feature_dict,
-                            }
-                        ],
+            points_list = args["points_list"]
+            for batch_start in range(0, len(points_list), self.batch_size):
+                points = []
+                for i, point_id in enumerate(
+                    points_list[batch_start : batch_start + self.batch_size],
+                    batch_start,
+                ):
+                    point = self.collect_point(
+                        point_id, indexing_plugin_mappings, payload_mapping
                     )
+                    logging.info(f"{i} {point['id']}")
+                    points.append(point)
+
+                self.compute_batch(points)
+
+                upsert_batcher.add([self.index_point(point) for point in points])
 
+            upsert_batcher.close()
             return
         except Exception as e:
             # raise e
+            upsert_batcher.close()
             logging.error(f"[Analyser] {e}")
             exc_type, exc_value, exc_traceback = sys.exc_info()
 
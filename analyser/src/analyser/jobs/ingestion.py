@@ -0,0 +1,282 @@
+import logging
+import queue
+import threading
+import traceback
+import uuid
+from concurrent import futures
+from typing import Dict, Iterator, Tuple
+
+from analyser.shared_object import SharedObject
+from analyser.jobs.indexing import IndexingJob
+from analyser.plugins.indexer_plugin import UpsertBatcher
+
+default_config = {
+    "num_workers": 4,
+    "queue_size": 256,
+    "batch_timeout": 1.0,
+    # thumbnails are stored on upload instead of being created when first requested
+    "thumbnails": False,
+}
+
+# marks the end of the items in a queue
+END = object()
+
+
+class IngestionPipeline:
+    """Stores and indexes a stream of points in stages.
+
+    receive -> decode/persist (num_workers threads) -> embedding batcher ->
+    upsert batcher (see UpsertBatcher). The stages are connected by bounded queues, so the slowest
+    stage throttles the stream while indexing already runs during the upload.
+    `future` is done when the last point is upserted.
+    """
+
+    def __init__(
+        self,
+        shared_object: SharedObject,
+        config: Dict = None,
+        indexing_config: Dict = None,
+    ):
+        self.shared_object = shared_object
+        self.config = {**default_config, **(config or {})}
+
+        self.indexing_job = IndexingJob(shared_object, config=indexing_config)
+
+        queue_size = self.config.get("queue_size")
+        self.persist_queue = queue.Queue(maxsize=queue_size)
+        # replies are small and the workers must not block if the client is gone
+        self.reply_queue = queue.Queue()
+        self.embed_queue = queue.Queue(maxsize=queue_size)
+        self.upsert_queue = queue.Queue(maxsize=queue_size)
+
+        self.num_workers = self.config.get("num_workers")
+        self.num_running_workers = self.num_workers
+        self.lock = threading.Lock()
+
+        self.future = futures.Future()
+        self.future.set_running_or_notify_cancel()
+
+    def __call__(self, request_iterator) -> Iterator[Tuple[str, str]]:
+        """Yields (point_id, status) as soon as a point is stored"""
+        threads = [
+            threading.Thread(target=self.receive, args=(request_iterator,)),
+            threading.Thread(target=self.embed),
+            threading.Thread(target=self.upsert),
+        ] + [threading.Thread(target=self.persist) for _ in range(self.num_workers)]
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        num_finished = 0
+        while num_finished < self.num_workers:
+            reply = self.reply_queue.get()
+            if reply is END:
+                num_finished += 1
+                continue
+            yield reply
+
+    def receive(self, request_iterator):
+        try:
+            for data_point in request_iterator:
+                self.persist_queue.put(data_point)
+        except Exception as e:
+            logging.error(f"[IngestionPipeline::receive] {repr(e)}")
+        finally:
+            for _ in range(self.num_workers):
+                self.persist_queue.put(END)
+
+    def persist(self):
+        while True:
+            data_point = self.persist_queue.get()
+            if data_point is END:
+                break
+
+            # TODO check if key already exists
+            point_id = data_point.id if data_point.id else uuid.uuid4().hex
+            try:
+                self.persist_point(point_id, data_point)
+            except Exception as e:
+                logging.error(f"[IngestionPipeline::persist] {point_id}: {repr(e)}")
+                logging.error(traceback.format_exc())
+                self.reply_queue.put((point_id, "error"))
+                continue
+            finally:
+                # searches must not return the cached data of a replaced point
+                if self.shared_object.hydrator is not None:
+                    self.shared_object.hydrator.invalidate([point_id])
+
+            self.reply_queue.put((point_id, "ok"))
+            self.embed_queue.put((point_id, data_point.collection_name))
+
+        self.reply_queue.put(END)
+
+        # the last worker closes the next stage
+        with self.lock:
+            self.num_running_workers -= 1
+            if self.num_running_workers == 0:
+                self.embed_queue.put(END)
+
+    def persist_point(self, point_id, data_point):
+        with self.shared_object.data_manager.create_data(
+            "ListData", data_id=point_id
+        ) as list_data:
+            for i, data in enumerate(data_point.data):
+                data_type = data.WhichOneof("data")
+
+                data_id = data.id if data.id else uuid.uuid4().hex
+
+                if data_type == "image":
+                    with list_data.create_data(
+                        "ImageData", data.name, data_id=data_id
+                    ) as image_data:
+                        if not image_data.save_encoded(
+                            data.image.content,
+                            ext=data.image.ext,
+                            thumbnail=self.config.get("thumbnails"),
+                        ):
+                            raise ValueError(f"Invalid image '{data.name}'")
+
+                elif data_type == "bool":
+                    with list_data.create_data(
+                        "BoolData", data.name, data_id=data_id
+                    ) as bool_data:
+                        bool_data.value = data.bool.value
+
+                elif data_type == "int":
+                    with list_data.create_data(
+                        "IntData", data.name, data_id=data_id
+                    ) as int_data:
+                        int_data.value = data.int.value
+
+                elif data_type == "float":
+                    with list_data.create_data("FloatData", data.name) as float_data:
+                        float_data.value = data.float.value
+
+                elif data_type == "text":
+                    with list_data.create_data(
+                        "TextData", data.name, data_id=data_id
+                    ) as text_data:
+                        text_data.text = data.text.text
+
+                elif data_type == "geo":
+                    with list_data.create_data(
+                        "GeoData", data.name, data_id=data_id
+                    ) as geo_data:
+                        geo_data.lat = data.geo.lat
+                        geo_data.lon = data.geo.lon
+
+                else:
+                    logging.warning(
+                        f"[IngestionPipeline::persist_point] Data type '{data_type}' is not supported."
+                    )
+
+        self.shared_object.collection_database.add_point(list_data)
+
+    def mappings(self, collection_name, cache):
+        collection_manager = self.shared_object.indexer_plugin_manager
+
+        if collection_name not in cache:
+            if collection_name not in collection_manager:
+                logging.error(
+                    f"[IngestionPipeline] Unknown collection '{collection_name}'"
+                )
+                cache[collection_name] = None
+            else:
+                cache[collection_name] = (
+                    collection_manager.get_indexing_plugin_mappings(collection_name),
+                    collection_manager.get_payload_mapping(collection_name),
+                )
+        return cache[collection_name]
+
+    def embed(self):
+        # a partial batch is embedded if no new point arrives within batch_timeout
+        batch_size = self.indexing_job.batch_size
+        batch_timeout = self.config.get("batch_timeout")
+
+        mappings = {}
+        points = []
+        done = False
+        # the next stage is always closed, otherwise the pipeline never finishes
+        try:
+            while not done:
+                try:
+                    item = self.embed_queue.get(timeout=batch_timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is END:
+                    done = True
+                elif item is not None:
+                    point_id, collection_name = item
+                    try:
+                        mapping = self.mappings(collection_name, mappings)
+                        if mapping is not None:
+                            point = self.indexing_job.collect_point(point_id, *mapping)
+                            points.append((collection_name, point))
+                    except Exception as e:
+                        logging.error(
+                            f"[IngestionPipeline::embed] {point_id}: {repr(e)}"
+                        )
+
+                if len(points) == 0:
+                    continue
+                if len(points) < batch_size and item is not None and not done:
+                    continue
+
+                try:
+                    self.indexing_job.compute_batch([point for _, point in points])
+                    for collection_name, point in points:
+                        self.upsert_queue.put(
+                            (collection_name, self.indexing_job.index_point(point))
+                        )
+                except Exception as e:
+                    logging.error(f"[IngestionPipeline::embed] {repr(e)}")
+                    logging.error(traceback.format_exc())
+                points = []
+        finally:
+            self.upsert_queue.put(END)
+
+    def upsert(self):
+        upsert_config = self.indexing_job.config.get("upsert")
+        collection_manager = self.shared_object.indexer_plugin_manager
+
+        num_points = 0
+        batchers = {}
+        # the future is always set, so the job doesn't stay running in the registry
+        try:
+            while True:
+                # the batchers send partial batches after max_delay on their own
+                item = self.upsert_queue.get()
+                if item is END:
+                    break
+
+                try:
+                    collection_name, point = item
+                    if collection_name not in batchers:
+                        batchers[collection_name] = UpsertBatcher(
+                            collection_manager, collection_name, config=upsert_config
+                        )
+                    batchers[collection_name].add([point])
+                    num_points += 1
+                except Exception as e:
+                    logging.error(f"[IngestionPipeline::upsert] {repr(e)}")
+                    logging.error(traceback.format_exc())
+        finally:
+            error = None
+            num_failed = 0
+            for batcher in batchers.values():
+                try:
+                    num_failed += batcher.close()
+                except Exception as e:
+                    logging.error(f"[IngestionPipeline::upsert] {repr(e)}")
+                    logging.error(traceback.format_exc())
+                    error = e
+
+            logging.info(
+                f"[IngestionPipeline] {num_points - num_failed} points indexed, {num_failed} failed"
+            )
+            if error is None:
+                self.future.set_result(None)
+            else:
+                self.future.set_exception(error)
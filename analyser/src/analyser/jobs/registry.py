@@ -0,0 +1,134 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent import futures
+from typing import Any, Dict
+
+default_config = {"max_jobs": 1000, "max_result_mb": 256, "ttl": 600}
+
+
+def result_size(result: Any) -> int:
+    """Approximate number of bytes held by the result of a job"""
+    if result is None:
+        return 0
+    if hasattr(result, "ByteSize"):
+        return result.ByteSize()
+    if isinstance(result, (bytes, str)):
+        return len(result)
+    try:
+        return len(json.dumps(result, default=str))
+    except Exception:
+        return 0
+
+
+class JobRegistry:
+    """Keeps track of the futures of submitted jobs by id.
+
+    Finished jobs are evicted after `ttl` seconds and, in the order they finished,
+    as soon as there are more than `max_jobs` jobs or their results take more
+    than `max_result_mb`. Running jobs are never evicted.
+    """
+
+    def __init__(self, config: Dict = None):
+        self.config = {**default_config, **(config or {})}
+        self.max_jobs = self.config.get("max_jobs")
+        self.max_bytes = self.config.get("max_result_mb") * 1024 * 1024
+        self.ttl = self.config.get("ttl")
+
+        # jobs in the order they are submitted
+        self.jobs = OrderedDict()
+        # finished jobs in the order they finished, so eviction stops at the first
+        # job that is kept
+        self.finished = OrderedDict()
+        self.num_bytes = 0
+        self.counters = Counter()
+        self.lock = threading.Lock()
+
+    def submit(self, job_id: str, future: futures.Future, **kwargs) -> Dict:
+        job = {
+            "id": job_id,
+            "future": future,
+            "state": "running",
+            "size": 0,
+            "submitted_at": time.monotonic(),
+            "finished_at": None,
+            **kwargs,
+        }
+        with self.lock:
+            self.jobs[job_id] = job
+            self.counters["submitted"] += 1
+            self.evict()
+
+        future.add_done_callback(lambda x: self.finish(job_id, x))
+        return job
+
+    def finish(self, job_id: str, future: futures.Future) -> None:
+        error = future.cancelled() or future.exception() is not None
+        size = 0 if error else result_size(future.result())
+
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+
+            job["state"] = "error" if error else "done"
+            job["size"] = size
+            job["finished_at"] = time.monotonic()
+
+            self.finished[job_id] = job
+            self.num_bytes += size
+            self.counters[job["state"]] += 1
+            self.evict()
+
+    def get(self, job_id: str) -> Dict | None:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or self.expired(job, time.monotonic()):
+                return None
+            return job
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def evict(self) -> None:
+        # has to be called with the lock held
+        now = time.monotonic()
+        while self.finished:
+            job_id, job = next(iter(self.finished.items()))
+            if not (
+                self.expired(job, now)
+                or len(self.jobs) > self.max_jobs
+                or self.num_bytes > self.max_bytes
+            ):
+                break
+            self.remove(job_id)
+
+        if len(self.jobs) > self.max_jobs:
+            logging.warning(
+                f"[JobRegistry::evict] {len(self.jobs)} running jobs exceed max_jobs"
+            )
+
+    def expired(self, job: Dict, now: float) -> bool:
+        return job["state"] != "running" and now - job["finished_at"] > self.ttl
+
+    def remove(self, job_id: str) -> None:
+        job = self.jobs.pop(job_id)
+        self.finished.pop(job_id, None)
+        self.num_bytes -= job["size"]
+        self.counters["evicted"] += 1
+
+    def stats(self) -> Dict:
+        with self.lock:
+            states = Counter(x["state"] for x in self.jobs.values())
+            return {
+                "running": states["running"],
+                "done": states["done"],
+                "error": states["error"],
+                "num_bytes": self.num_bytes,
+                **{f"total_{k}": v for k, v in self.counters.items()},
+            }
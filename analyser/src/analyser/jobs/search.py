@@ -1,49 +1,50 @@
+import asyncio
 import logging
 
 from inference import InferenceServerFactory
-from plugins import IndexerPluginManager, ComputePluginManager
+from plugins import IndexerPluginManager, ComputePluginManager, FusionFactory
 from plugins.cache import Cache
 from data import DataManager
 from fnmatch import fnmatch
 import re
 
-from interface import searcher_pb2, common_pb2
+from interface import searcher_pb2, common_pb2, data_pb2
 
 from interface.utils import meta_to_proto
 from google.protobuf.json_format import MessageToDict, ParseDict
 
 from typing import Dict
 from analyser.shared_object import SharedObject
+from analyser.jobs.hydration import ResultHydrator
 
 
 class SearchJob:
-    def __init__(self, shared_object: SharedObject, config: Dict = None):
+    def __init__(
+        self,
+        shared_object: SharedObject,
+        config: Dict = None,
+        hydrator: ResultHydrator = None,
+    ):
         self.shared_object = shared_object
         if config is None:
             config = {}
         self.config = config
 
-    def reranking(self, result_list):
-        # build lut key, [results]
-        lut = {}
-        for x in result_list:
-            lut.setdefault(x["id"], [])
-            lut[x["id"]].append(x)
-
-        # compute max score
-        result = []
-        for _, v in lut.items():
-            # s = max([x["score"] for x in v])
-            s = sum([x["score"] for x in v]) / len(v)
-
-            result.append([v[0], s])
-
-        # sort after lowest key
-        result_list = [x[0] for x in sorted(result, key=lambda x: -x[1])]
-
-        return result_list
+        # the hydrator is shared between search jobs to reuse its cache
+        if hydrator is None:
+            hydrator = ResultHydrator(
+                self.shared_object.data_manager, config=self.config.get("hydration")
+            )
+        self.hydrator = hydrator
+
+        # fusion of the results of several indexes and collections
+        fusion_config = self.config.get("fusion", {})
+        self.fusion = FusionFactory().build(
+            fusion_config.get("type", "rrf"), config=fusion_config.get("params")
+        )
 
-    def search_collection(self, query, collection):
+    def parse_query(self, query, collection):
+        """Returns the filters and the plugin runs for the vector terms of a query"""
         collection_manager = self.shared_object.indexer_plugin_manager
 
         indexing_plugin_mappings = collection_manager.get_indexing_plugin_mappings(
@@ -57,7 +58,7 @@ class SearchJob:
         payload_mapping = collection_manager.get_payload_mapping(collection)
 
         filters = []
-        feature_list = []
+        plugin_runs = []
         for term in query.terms:
             term_type = term.WhichOneof("term")
             logging.error(term)
@@ -84,6 +85,12 @@ class SearchJob:
                     if input_type == "text":
                         data_dict[vector_input.name] = vector_input
 
+                # an unset weight is 0 in proto3, so fall back to an equal weighting
+                index_weights = {
+                    x.name: x.weight if x.weight > 0 else 1.0
+                    for x in vector_term.vector_indexes
+                }
+
                 data_plugin_mapping = []
                 for search_plugin_mapping in search_plugin_mappings:
                     if len(vector_term.vector_indexes) > 0:
@@ -110,85 +117,265 @@ class SearchJob:
                         if fnmatch(data_plugin[1], k):
                             data.name = v
 
-                    request = common_pb2.PluginRun(
-                        plugin=data_plugin[0].compute_plugin,
-                        inputs=[data],
+                    plugin_runs.append(
+                        {
+                            "compute_plugin": data_plugin[0].compute_plugin,
+                            "index_name": index_name,
+                            "weight": index_weights.get(index_name, 1.0),
+                            "request": common_pb2.PluginRun(
+                                plugin=data_plugin[0].compute_plugin,
+                                inputs=[data],
+                            ),
+                        }
                     )
 
-                    results = self.shared_object.inference_server_manager(
-                        self.shared_object.compute_plugin_manager,
-                        compute_plugin_name=data_plugin[0].compute_plugin,
-                        request=request,
-                    )
+        return filters, plugin_runs
+
+    def to_query(self, plugin_run, results):
+        if not results or len(results.results) <= 0:
+            logging.warning(f"No outputs from plugin ({plugin_run['compute_plugin']})")
+            return None
+
+        # TODO multivector plugins
+        return {
+            "index_name": plugin_run["index_name"],
+            "value": list(results.results[0].result.feature.feature),
+            "weight": plugin_run["weight"],
+        }
+
+    def search_arguments(self, query, collection, filters, feature_list):
+        return {
+            "collection_name": collection,
+            "queries": feature_list,
+            "filters": filters,
+            "size": self.limit(query),
+            "fusion": self.fusion,
+            # only the requested fields of the payload are transferred
+            "payload_fields": (
+                list(query.include_fields) if len(query.include_fields) > 0 else None
+            ),
+        }
 
-                    if not results or len(results.results) <= 0:
-                        logging.warning(
-                            f"No outputs from plugin ({data_plugin[0].compute_plugin})"
-                        )
-                        continue
+    def search_collection(self, query, collection):
+        filters, plugin_runs = self.parse_query(query, collection)
 
-                    # TODO multivector plugins
-                    feature_vecs = list(results.results[0].result.feature.feature)
-                    feature_list.append(
-                        {"index_name": index_name, "value": feature_vecs}
-                    )
-        result = self.shared_object.indexer_plugin_manager.search(
-            collection_name=collection,
-            queries=feature_list,
-            filters=filters,
-            size=getattr(query, "limit", 100),
+        feature_list = []
+        for plugin_run in plugin_runs:
+            results = self.shared_object.inference_server_manager(
+                self.shared_object.compute_plugin_manager,
+                compute_plugin_name=plugin_run["compute_plugin"],
+                request=plugin_run["request"],
+            )
+            feature = self.to_query(plugin_run, results)
+            if feature is not None:
+                feature_list.append(feature)
+
+        return self.shared_object.indexer_plugin_manager.search(
+            **self.search_arguments(query, collection, filters, feature_list)
+        )
+
+    async def search_collection_async(self, query, collection):
+        filters, plugin_runs = self.parse_query(query, collection)
+
+        # the plugins of all vector terms run concurrently
+        all_results = await asyncio.gather(
+            *[
+                self.shared_object.inference_server_manager.call_async(
+                    self.shared_object.compute_plugin_manager,
+                    compute_plugin_name=plugin_run["compute_plugin"],
+                    request=plugin_run["request"],
+                )
+                for plugin_run in plugin_runs
+            ]
+        )
+        feature_list = [
+            x for x in map(self.to_query, plugin_runs, all_results) if x is not None
+        ]
+
+        return await self.shared_object.indexer_plugin_manager.search_async(
+            **self.search_arguments(query, collection, filters, feature_list)
+        )
+
+    def limit(self, request):
+        # an unset limit is 0 in proto3
+        return request.limit if request.limit > 0 else 100
+
+    def collections(self, request):
+        if len(request.collections) == 0:
+            return self.shared_object.indexer_plugin_manager.list_collections()
+        return request.collections
+
+    def merge(self, request, collection_results):
+        collection_results = [x for x in collection_results if x]
+        if len(collection_results) == 0:
+            logging.warning(f"No search results")
+            return []
+
+        # the payload is only loaded for the final top-k of all collections
+        if len(collection_results) == 1:
+            return collection_results[0]
+
+        metas = {x["id"]: x.get("meta", {}) for y in collection_results for x in y}
+        return [
+            {**x, "meta": metas[x["id"]]}
+            for x in self.fusion(collection_results, size=self.limit(request))
+        ]
+
+    def rank(self, request):
+        return self.merge(
+            request,
+            [
+                self.search_collection(request, collection)
+                for collection in self.collections(request)
+            ],
         )
-        return result
+
+    async def rank_async(self, request):
+        return self.merge(
+            request,
+            await asyncio.gather(
+                *[
+                    self.search_collection_async(request, collection)
+                    for collection in self.collections(request)
+                ]
+            ),
+        )
+
+    def build_entries(self, request, results):
+        # exact field names that are stored in the payload don't need the data files
+        exact_fields = [
+            x for x in request.include_fields if not re.search(r"[*?\[]", x)
+        ]
+        payload_only = len(exact_fields) == len(request.include_fields) > 0
+
+        payloads = [
+            {
+                name: value
+                for name, value in x.get("meta", {}).items()
+                if self.is_payload_data(name, value)
+            }
+            for x in results
+        ]
+
+        # points are only read from the data files if the payload isn't sufficient
+        to_hydrate = [
+            i
+            for i, x in enumerate(payloads)
+            if not payload_only or any(name not in x for name in exact_fields)
+        ]
+        hydrated = dict(
+            zip(
+                to_hydrate,
+                self.hydrator(
+                    [results[i]["id"] for i in to_hydrate],
+                    include_fields=list(request.include_fields),
+                    exclude=[set(payloads[i]) for i in to_hydrate],
+                    include_media=request.include_media,
+                    include_thumbnail=request.include_thumbnail,
+                ),
+            )
+        )
+
+        entries = []
+        for i, x in enumerate(results):
+            entry = searcher_pb2.SearchResultEntry(id=x["id"])
+
+            for name, value in payloads[i].items():
+                self.add_data(entry, name, self.payload_to_proto(value))
+
+            for name, data in hydrated.get(i, []):
+                self.add_data(entry, name, data)
+
+            entries.append(entry)
+
+        return entries
 
     def __call__(self, query):
         # TODO customize the indexing path and plugin behind it
 
         request = ParseDict(query["request"], searcher_pb2.SearchRequest())
 
-        collection_manager = self.shared_object.indexer_plugin_manager
+        return MessageToDict(self.search(request))
 
-        collections = request.collections
+    def search(
+        self, request: searcher_pb2.SearchRequest
+    ) -> searcher_pb2.ListSearchResultReply:
+        results = self.rank(request)
 
-        if len(request.collections) == 0:
-            collections = collection_manager.list_collections()
-
-        results = []
-        for collection in collections:
-            result = self.search_collection(request, collection)
-            if result:
-                results.extend(result)
-            else:
-                logging.warning(f"No search results")
-
-        results = self.reranking(results)
-
-        proto_results = searcher_pb2.ListSearchResultReply()
-        for x in results:
-            entry = proto_results.entries.add()
-            entry.id = x["id"]
-            with self.shared_object.data_manager.load(x["id"]) as list_data:
-                for name, data in list_data:
-                    with data as data:
-                        # check if we should filter the results
-                        to_include = False
-                        if len(request.include_fields) == 0:
-                            to_include = True
-
-                        for x in request.include_fields:
-                            if fnmatch(name, x):
-                                to_include = True
-
-                        if to_include:
-                            # copy the data stored in Data to the proto response
-                            pb_data = entry.data.add()
-                            pb_data.CopyFrom(data.to_proto())
-                            pb_data.name = name
-
-                            data_type = pb_data.WhichOneof("data")
-
-                            if data_type == "text":
-                                if match := re.match(r"^(.*)\/_(.{2})$", name):
-                                    pb_data.name = match.group(1)
-                                    pb_data.text.language = match.group(2)
-
-        return MessageToDict(proto_results)
+        return searcher_pb2.ListSearchResultReply(
+            entries=self.build_entries(request, results)
+        )
+
+    async def search_async(
+        self, request: searcher_pb2.SearchRequest
+    ) -> searcher_pb2.ListSearchResultReply:
+        results = await self.rank_async(request)
+
+        return searcher_pb2.ListSearchResultReply(
+            entries=await asyncio.to_thread(self.build_entries, request, results)
+        )
+
+    def hits_pages(self, results):
+        page_size = self.config.get("stream_page_size", 100)
+        for start in range(0, len(results), page_size):
+            yield searcher_pb2.SearchStreamReply(
+                offset=start,
+                hits=[
+                    searcher_pb2.SearchHit(id=x["id"], score=x["score"])
+                    for x in results[start : start + page_size]
+                ],
+            )
+
+    def entry_chunks(self, results):
+        chunk_size = self.config.get("stream_chunk_size", 25)
+        for start in range(0, len(results), chunk_size):
+            yield start, results[start : start + chunk_size]
+
+    def stream(self, request: searcher_pb2.SearchRequest):
+        # the complete ranking is sent first, the data of the hits follows in chunks
+        results = self.rank(request)
+
+        yield from self.hits_pages(results)
+
+        for offset, chunk in self.entry_chunks(results):
+            yield searcher_pb2.SearchStreamReply(
+                offset=offset, entries=self.build_entries(request, chunk)
+            )
+
+    async def stream_async(self, request: searcher_pb2.SearchRequest):
+        results = await self.rank_async(request)
+
+        for reply in self.hits_pages(results):
+            yield reply
+
+        # reading and converting the data is blocking, so it runs in a thread
+        for offset, chunk in self.entry_chunks(results):
+            yield searcher_pb2.SearchStreamReply(
+                offset=offset,
+                entries=await asyncio.to_thread(self.build_entries, request, chunk),
+            )
+
+    def is_payload_data(self, name, value):
+        # internal keys and lists or dicts are taken from the data files instead
+        return not name.startswith("_") and isinstance(value, (bool, int, float, str))
+
+    def payload_to_proto(self, value):
+        if isinstance(value, bool):
+            return data_pb2.Data(bool=data_pb2.BoolData(value=value))
+        if isinstance(value, int):
+            return data_pb2.Data(int=data_pb2.IntData(value=value))
+        if isinstance(value, float):
+            return data_pb2.Data(float=data_pb2.FloatData(value=value))
+        return data_pb2.Data(text=data_pb2.TextData(text=str(value)))
+
+    def add_data(self, entry, name, data):
+        pb_data = entry.data.add()
+        pb_data.CopyFrom(data)
+        pb_data.name = name
+
+        data_type = pb_data.WhichOneof("data")
+
+        if data_type == "text":
+            if match := re.match(r"^(.*)\/_(.{2})$", name):
+                pb_data.name = match.group(1)
+                pb_data.text.language = match.group(2)
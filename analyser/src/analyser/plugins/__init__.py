@@ -1,3 +1,4 @@
 from analyser.plugins.mapping_plugin import *
 from analyser.plugins.indexer_plugin import *
 from analyser.plugins.compute_plugin import *
+from analyser.plugins.fusion_plugin import *
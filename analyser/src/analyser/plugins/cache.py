@@ -1,19 +1,181 @@
 import os
 import re
-import h5py
+import json
 
 import numpy as np
+import numpy.typing as npt
 
 import logging
 
 import uuid
 import pickle
+import msgpack
 
+from typing import List
 from multiprocessing import Lock
 
 
+class FeatureStore:
+    """Append-only store for fixed-width vectors.
+
+    Vectors are written into fixed size ``.npy`` segments that are memory-mapped.
+    The index file only contains the ids in row order (``id_size`` bytes per row),
+    so opening a store reads neither the vectors nor a serialized dict.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        dtype: str = "float32",
+        segment_size: int = 65536,
+        id_size: int = 32,
+        mode: str = "a",
+    ):
+        self.path = path
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.segment_size = segment_size
+        self.id_dtype = np.dtype(f"S{id_size}")
+        self.mode = mode
+
+        os.makedirs(self.path, exist_ok=True)
+
+        self.index_path = os.path.join(self.path, "index.bin")
+        self.segments = []
+        self.pending = {}
+
+        self.read_index()
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"segment_{segment:06d}.npy")
+
+    def read_index(self) -> None:
+        if os.path.exists(self.index_path):
+            size = os.path.getsize(self.index_path)
+            # drop a record that was only partially written
+            valid_size = size - size % self.id_dtype.itemsize
+            if valid_size != size and self.mode != "r":
+                logging.warning(f"FeatureStore: truncate index {self.index_path}")
+                with open(self.index_path, "r+b") as f:
+                    f.truncate(valid_size)
+            ids = (
+                np.memmap(
+                    self.index_path,
+                    dtype=self.id_dtype,
+                    mode="r",
+                    shape=(valid_size // self.id_dtype.itemsize,),
+                )
+                if valid_size > 0
+                else np.zeros([0], dtype=self.id_dtype)
+            )
+        else:
+            ids = np.zeros([0], dtype=self.id_dtype)
+
+        # sorted ids allow vectorized lookups without building a dict
+        self.num_rows = ids.shape[0]
+        self.sorted_order = np.argsort(ids, kind="stable")
+        self.sorted_ids = ids[self.sorted_order]
+
+        num_segments = (self.num_rows + self.segment_size - 1) // self.segment_size
+        self.segments = [self.open_segment(i) for i in range(num_segments)]
+
+    def open_segment(self, segment: int) -> np.memmap:
+        path = self.segment_path(segment)
+        if os.path.exists(path):
+            return np.lib.format.open_memmap(
+                path, mode="r" if self.mode == "r" else "r+"
+            )
+        return np.lib.format.open_memmap(
+            path, mode="w+", dtype=self.dtype, shape=(self.segment_size, self.dim)
+        )
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __contains__(self, id: str) -> bool:
+        return self.rows([id])[0] >= 0
+
+    def rows(self, ids: List[str]) -> npt.NDArray:
+        encoded = [x.encode() for x in ids]
+        keys = np.asarray(encoded, dtype=self.id_dtype)
+        positions = np.searchsorted(self.sorted_ids, keys)
+        positions = np.minimum(positions, max(len(self.sorted_ids) - 1, 0))
+
+        rows = np.full(len(ids), -1, dtype=np.int64)
+        if len(self.sorted_ids) > 0:
+            found = self.sorted_ids[positions] == keys
+            # longer ids are never stored, they must not match their truncated prefix
+            found &= np.asarray([len(x) <= self.id_dtype.itemsize for x in encoded])
+            rows[found] = self.sorted_order[positions[found]]
+
+        for i, id in enumerate(ids):
+            if id in self.pending:
+                rows[i] = self.pending[id]
+        return rows
+
+    def row(self, row: int) -> npt.NDArray:
+        return self.segments[row // self.segment_size][row % self.segment_size]
+
+    def get(self, id: str) -> npt.NDArray | None:
+        row = self.rows([id])[0]
+        if row < 0:
+            return None
+        return self.row(row)
+
+    def get_many(self, ids: List[str]) -> npt.NDArray:
+        """Returns the vectors of all ids, rows of unknown ids are filled with nan.
+
+        Consecutive rows inside one segment are returned as a view of the memory map,
+        all other requests copy only the requested rows.
+        """
+        rows = self.rows(ids)
+        if len(rows) > 0 and rows[0] >= 0:
+            segment, start = divmod(int(rows[0]), self.segment_size)
+            if start + len(rows) <= self.segment_size and np.array_equal(
+                rows, np.arange(rows[0], rows[0] + len(rows))
+            ):
+                return self.segments[segment][start : start + len(rows)]
+
+        result = np.full((len(ids), self.dim), np.nan, dtype=self.dtype)
+        for i, row in enumerate(rows):
+            if row >= 0:
+                result[i] = self.row(row)
+        return result
+
+    def append(self, id: str, value: npt.ArrayLike) -> int:
+        assert self.mode != "r", "Feature store is open read only"
+
+        if len(id.encode()) > self.id_dtype.itemsize:
+            raise ValueError(f"Id {id} is longer than {self.id_dtype.itemsize} bytes")
+
+        row = self.rows([id])[0]
+        if row >= 0:
+            self.row(row)[:] = value
+            return row
+
+        row = self.num_rows
+        segment = row // self.segment_size
+        if segment >= len(self.segments):
+            self.segments.append(self.open_segment(segment))
+
+        # the vector is persisted before its id, a crash leaves only an unused row
+        self.segments[segment][row % self.segment_size] = value
+        self.segments[segment].flush()
+        with open(self.index_path, "ab") as f:
+            f.write(np.asarray([id.encode()], dtype=self.id_dtype).tobytes())
+
+        self.pending[id] = row
+        self.num_rows += 1
+        return row
+
+    def flush(self) -> None:
+        for segment in self.segments:
+            segment.flush()
+
+
 class Cache:
-    def __init__(self, cache_dir, mode="a"):
+    def __init__(self, cache_dir, mode="a", dtype="float32"):
         self.cache_dir = cache_dir
 
         os.makedirs(self.cache_dir, exist_ok=True)
@@ -22,41 +184,48 @@ class Cache:
         self.classifier_data = {}
         self.feature_data = {}
 
-        self.length = 4096
+        self.dtype = dtype
 
         self.num_client = 0
         self.mutex = Lock()
         self.dirty = False
         self.mode = mode
 
+    @property
+    def manifest_path(self):
+        return os.path.join(self.cache_dir, "cache.json")
+
     def __enter__(self):
 
         with self.mutex:
             if self.num_client == 0:
                 logging.info("Cache: Read cache files")
-                if os.path.exists(os.path.join(self.cache_dir, "data.pkl")):
-                    with open(os.path.join(self.cache_dir, "data.pkl"), "rb") as f:
-                        self.cache_data = pickle.load(f)
+                if not os.path.exists(self.manifest_path) and os.path.exists(
+                    self.legacy_path
+                ):
+                    self.read_legacy()
+                elif os.path.exists(self.manifest_path):
+                    with open(self.manifest_path, "r") as f:
+                        self.cache_data = json.load(f)
 
-                    logging.info("Cache: 1")
                     for _, c in self.cache_data["classifier"].items():
-                        logging.info(os.path.join(self.cache_dir, f"{c['id']}.pkl"))
-                        with open(os.path.join(self.cache_dir, f"{c['id']}.pkl"), "rb") as f:
-                            self.classifier_data[c["cache_name"]] = pickle.load(f)
+                        self.classifier_data[c["cache_name"]] = {}
+                        classifier_path = os.path.join(
+                            self.cache_dir, f"{c['id']}.msgpack"
+                        )
+                        if not os.path.exists(classifier_path):
+                            continue
+                        with open(classifier_path, "rb") as f:
+                            for id, value in msgpack.Unpacker(f):
+                                self.classifier_data[c["cache_name"]][id] = value
 
-                    logging.info("Cache: 2")
                     for _, c in self.cache_data["feature"].items():
-                        logging.info(os.path.join(self.cache_dir, f"{c['id']}.h5"))
-                        index_id = c["id"]
-                        self.feature_data[c["cache_name"]] = {
-                            "h5": h5py.File(os.path.join(self.cache_dir, f"{index_id}.h5"), self.mode),
-                            "max_size": 0,
-                        }
-                        self.feature_data[c["cache_name"]]["max_size"] = self.feature_data[c["cache_name"]]["h5"][
-                            "data"
-                        ].shape[0]
-                        print(self.feature_data[c["cache_name"]])
-                    logging.info("Cache: 3")
+                        self.feature_data[c["cache_name"]] = FeatureStore(
+                            os.path.join(self.cache_dir, c["id"]),
+                            dim=c["d"],
+                            dtype=c.get("dtype", self.dtype),
+                            mode=self.mode,
+                        )
 
             self.num_client += 1
 
@@ -70,18 +239,75 @@ class Cache:
         with self.mutex:
             if self.num_client == 1 and self.dirty:
                 logging.info("Cache: Save cache files")
-                with open(os.path.join(self.cache_dir, "data.pkl"), "wb") as f:
-                    pickle.dump(self.cache_data, f)
+                for store in self.feature_data.values():
+                    store.flush()
+            self.num_client -= 1
 
-                for _, c in self.cache_data["classifier"].items():
+    @property
+    def legacy_path(self):
+        # manifest of caches written before the feature stores
+        return os.path.join(self.cache_dir, "data.pkl")
 
-                    with open(os.path.join(self.cache_dir, f"{c['id']}.pkl"), "wb") as f:
-                        pickle.dump(self.classifier_data[c["cache_name"]], f)
+    def read_legacy(self):
+        if self.mode == "r":
+            logging.warning(
+                f"Cache: Found a cache in the old format in {self.cache_dir}, it is "
+                "ignored because the cache is open read only"
+            )
+            return
 
-                for _, c in self.cache_data["feature"].items():
+        logging.warning(
+            f"Cache: Found a cache in the old format in {self.cache_dir}, it is "
+            "converted and the old files can be deleted afterwards"
+        )
+        with open(self.legacy_path, "rb") as f:
+            legacy_data = pickle.load(f)
+
+        for c in legacy_data.get("classifier", {}).values():
+            classifier_path = os.path.join(self.cache_dir, f"{c['id']}.pkl")
+            if not os.path.exists(classifier_path):
+                continue
+            with open(classifier_path, "rb") as f:
+                for id, value in pickle.load(f).items():
+                    self.write_entry({"id": id, "classifier": [value]})
+
+        features = legacy_data.get("feature", {})
+        if len(features) == 0:
+            return
 
-                    self.feature_data[c["cache_name"]]["h5"].close()
-            self.num_client -= 1
+        try:
+            import h5py
+        except ImportError:
+            logging.warning(
+                "Cache: h5py is not installed, the cached features are rebuilt"
+            )
+            return
+
+        for c in features.values():
+            feature_path = os.path.join(self.cache_dir, f"{c['id']}.h5")
+            if not os.path.exists(feature_path):
+                continue
+            with h5py.File(feature_path, "r") as f:
+                for id, index in c.get("entries", {}).items():
+                    self.write_entry(
+                        {
+                            "id": id,
+                            "feature": [
+                                {
+                                    "plugin": c["plugin"],
+                                    "type": c["type"],
+                                    "version": c["version"],
+                                    "value": f["data"][index],
+                                }
+                            ],
+                        }
+                    )
+
+    def write_manifest(self):
+        # the manifest only lists the caches, entries are stored in their own files
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump(self.cache_data, f)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
 
     def __getitem__(self, id):
         data_dict = {"id": id, "classifier": [], "feature": []}
@@ -91,76 +317,82 @@ class Cache:
                 data_dict["classifier"].append(self.classifier_data[cache_name][id])
 
         for cache_name, cache in self.cache_data["feature"].items():
-            if id in cache["entries"]:
-                h5_index = cache["entries"][id]
-                feature = self.feature_data[cache_name]["h5"]["data"][h5_index].tolist()
+            feature = self.feature_data[cache_name].get(id)
+            if feature is not None:
                 data_dict["feature"].append(
-                    {"plugin": cache["plugin"], "type": cache["type"], "version": cache["version"], "value": feature}
+                    {
+                        "plugin": cache["plugin"],
+                        "type": cache["type"],
+                        "version": cache["version"],
+                        "value": feature,
+                    }
                 )
 
         return data_dict
 
+    def get_many(self, cache_name: str, ids: List[str]) -> npt.NDArray | None:
+        if cache_name not in self.feature_data:
+            return None
+        return self.feature_data[cache_name].get_many(ids)
+
     def write(self, entry):
         if self.mode == "r":
             return
 
         with self.mutex:
-            self.dirty = True
-            id = entry["id"]
-            if "classifier" in entry:
-                for c in entry["classifier"]:
-                    cache_name = f"{c['plugin']}.{c['version']}"
-                    if cache_name not in self.cache_data["classifier"]:
-                        self.cache_data["classifier"][cache_name] = {
-                            "id": uuid.uuid4().hex,
-                            "cache_name": cache_name,
-                            "plugin": c["plugin"],
-                            "version": c["version"],
-                        }
-
-                    if cache_name not in self.classifier_data:
-                        self.classifier_data[cache_name] = {}
-                    self.classifier_data[cache_name][id] = c
-
-            if "feature" in entry:
-                for c in entry["feature"]:
-                    cache_name = f"{c['plugin']}.{c['type']}.{c['version']}"
-                    if cache_name not in self.cache_data["feature"]:
-                        self.cache_data["feature"][cache_name] = {
-                            "id": uuid.uuid4().hex,
-                            "cache_name": cache_name,
-                            "entries": {},
-                            "d": len(c["value"]),
-                            "type": c["type"],
-                            "plugin": c["plugin"],
-                            "version": c["version"],
-                        }
-
-                    if cache_name not in self.feature_data:
-                        index_id = self.cache_data["feature"][cache_name]["id"]
-                        self.feature_data[cache_name] = {
-                            "h5": h5py.File(os.path.join(self.cache_dir, f"{index_id}.h5"), "a"),
-                            "max_size": self.length,
-                        }
-
-                        self.feature_data[cache_name]["h5"].create_dataset(
-                            "data", [self.length] + [len(c["value"])], dtype=float, maxshape=[None] + [len(c["value"])]
-                        )
-
-                    self.feature_data[cache_name]["h5"]["data"][
-                        len(self.cache_data["feature"][cache_name]["entries"])
-                    ] = c["value"]
-
-                    if id not in self.cache_data["feature"][cache_name]["entries"]:
-                        self.cache_data["feature"][cache_name]["entries"][id] = len(
-                            self.cache_data["feature"][cache_name]["entries"]
-                        )
-
-                    if (
-                        len(self.cache_data["feature"][cache_name]["entries"])
-                        >= self.feature_data[cache_name]["max_size"]
-                    ):
-                        self.feature_data[cache_name]["max_size"] += self.length
-                        self.feature_data[cache_name]["h5"]["data"].resize(
-                            self.feature_data[cache_name]["max_size"], axis=0
-                        )
+            self.write_entry(entry)
+
+    def write_entry(self, entry):
+        # has to be called with the mutex held
+        self.dirty = True
+        id = entry["id"]
+        if "classifier" in entry:
+            for c in entry["classifier"]:
+                cache_name = f"{c['plugin']}.{c['version']}"
+                if cache_name not in self.cache_data["classifier"]:
+                    self.cache_data["classifier"][cache_name] = {
+                        "id": uuid.uuid4().hex,
+                        "cache_name": cache_name,
+                        "plugin": c["plugin"],
+                        "version": c["version"],
+                    }
+                    self.write_manifest()
+
+                if cache_name not in self.classifier_data:
+                    self.classifier_data[cache_name] = {}
+                self.classifier_data[cache_name][id] = c
+
+                classifier_id = self.cache_data["classifier"][cache_name]["id"]
+                with open(
+                    os.path.join(self.cache_dir, f"{classifier_id}.msgpack"), "ab"
+                ) as f:
+                    f.write(msgpack.packb([id, c]))
+
+        if "feature" in entry:
+            for c in entry["feature"]:
+                cache_name = f"{c['plugin']}.{c['type']}.{c['version']}"
+                if cache_name not in self.cache_data["feature"]:
+                    self.cache_data["feature"][cache_name] = {
+                        "id": uuid.uuid4().hex,
+                        "cache_name": cache_name,
+                        "d": len(c["value"]),
+                        "dtype": self.dtype,
+                        "type": c["type"],
+                        "plugin": c["plugin"],
+                        "version": c["version"],
+                    }
+                    self.write_manifest()
+
+                if cache_name not in self.feature_data:
+                    cache = self.cache_data["feature"][cache_name]
+                    self.feature_data[cache_name] = FeatureStore(
+                        os.path.join(self.cache_dir, cache["id"]),
+                        dim=cache["d"],
+                        dtype=cache["dtype"],
+                        mode=self.mode,
+                    )
+
+                try:
+                    self.feature_data[cache_name].append(id, c["value"])
+                except ValueError as e:
+                    logging.error(f"Cache: Feature not cached ({repr(e)})")
@@ -8,7 +8,6 @@ from typing import Dict
 from interface import analyser_pb2, data_pb2, common_pb2
 from analyser.plugins import ComputePlugin, ComputePluginFactory
 
-
 default_config = {
     "clip_image_plugin": "clip_image_xlm-roberta-base-vit-b-32_laion5b_s13b_b90k",
     "clip_text_plugin": "clip_text_xlm-roberta-base-vit-b-32_laion5b_s13b_b90k",
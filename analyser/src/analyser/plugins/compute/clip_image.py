@@ -96,6 +96,8 @@ default_config = {
     "multicrop": True,
     "max_dim": None,
     "min_dim": 224,
+    "batch_size": 32,
+    "num_workers": 4,
 }
 
 default_parameters = {
@@ -115,7 +117,10 @@ class ClipImageEmbeddingFeature(
         self.model_name = self.config.get("model", "xlm-roberta-base-ViT-B-32")
         self.pretrained = self.config.get("pretrained")
         self.embedding_size = self.config.get("embedding_size", 768)
+        self.batch_size = self.config.get("batch_size", 32)
+        self.num_workers = self.config.get("num_workers", 4)
         self.model = None
+        self.preprocess_pool = None
 
     def image_resize_crop(self, img, resize_size, crop_size):
         converted = image_resize(image_pad(img), size=crop_size)
@@ -140,6 +145,29 @@ class ClipImageEmbeddingFeature(
             self.model = model.visual
             self.preprocess = ImagePreprozessorWrapper(model, format=torch.float32)
 
+        # the pool is created here, because the plugin is pickled for the inference server
+        if self.preprocess_pool is None:
+            from concurrent import futures
+
+            self.preprocess_pool = futures.ThreadPoolExecutor(
+                max_workers=self.num_workers
+            )
+
+    def preprocess_image(self, content, resize_size, crop_size):
+        import imageio.v3 as iio
+
+        image = iio.imread(content)
+        # animated or multi page images are embedded by their first frame, so there
+        # is exactly one embedding per input
+        if image.ndim == 4:
+            image = image[0]
+
+        # image = image_resize(image, max_dim=self.max_dim, min_dim=self.min_dim)
+        # image = image_crop(image, [224, 224])
+
+        image = self.image_resize_crop(image, resize_size, crop_size)
+        return self.preprocess(image)
+
     def call(self, plugin_run: common_pb2.PluginRun):
         from sklearn.preprocessing import normalize
         import imageio.v3 as iio
@@ -153,41 +181,46 @@ class ClipImageEmbeddingFeature(
 
         self.init_model()
 
-        result = analyser_pb2.AnalyseReply()
-        for entry in inputs["image"]:
-            # image = image_from_proto(entry)
-            image = iio.imread(entry["content"])
-
-            # image = image_resize(image, max_dim=self.max_dim, min_dim=self.min_dim)
-            # image = image_crop(image, [224, 224])
-
-            image = self.image_resize_crop(
-                image, parameters.get("resize_size"), parameters.get("crop_size")
+        # decode and preprocess all images in parallel, the order of the inputs is kept
+        images = list(
+            self.preprocess_pool.map(
+                lambda entry: self.preprocess_image(
+                    entry["content"],
+                    parameters.get("resize_size"),
+                    parameters.get("crop_size"),
+                ),
+                inputs.get("image", []),
             )
-            image = self.preprocess(image).to(device)
+        )
+
+        result = analyser_pb2.AnalyseReply()
+        for batch_start in range(0, len(images), self.batch_size):
+            batch = torch.cat(images[batch_start : batch_start + self.batch_size])
+            batch = batch.to(device)
 
             with torch.no_grad(), torch.amp.autocast(device):
-                embedding = self.model(image)
-                embedding = torch.nn.functional.normalize(embedding, dim=-1).float()
-            embedding = embedding.cpu().detach()
-            # normalize
-            output = embedding / np.linalg.norm(np.asarray(embedding))
-            output = output.flatten()
-            data = data_pb2.Data(
-                id=uuid.uuid4().hex,
-                name="clip_embedding",
-                feature=data_pb2.Feature(
-                    type="clip_embedding", shape=output.shape, feature=output.tolist()
-                ),
-            )
+                embeddings = self.model(batch)
+                embeddings = torch.nn.functional.normalize(embeddings, dim=-1).float()
+            embeddings = embeddings.cpu().detach().numpy()
+
+            for output in embeddings:
+                data = data_pb2.Data(
+                    id=uuid.uuid4().hex,
+                    name="clip_embedding",
+                    feature=data_pb2.Feature(
+                        type="clip_embedding",
+                        shape=output.shape,
+                        feature=output.tolist(),
+                    ),
+                )
 
-            result.results.append(
-                common_pb2.PluginResult(
-                    plugin=self.instance_name,
-                    type=self.name(),
-                    version=self.version(),
-                    result=data,
+                result.results.append(
+                    common_pb2.PluginResult(
+                        plugin=self.instance_name,
+                        type=self.name(),
+                        version=self.version(),
+                        result=data,
+                    )
                 )
-            )
 
         return result
@@ -6,16 +6,44 @@ from analyser.utils import image_from_proto, image_resize, image_crop
 
 
 import logging
+import threading
+from collections import OrderedDict
 
 from typing import Union, List, Dict
 
-
-default_config = {}
+default_config = {"batch_size": 256, "cache_size": 4096}
 
 
 default_parameters = {}
 
 
+class EmbeddingLRUCache:
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.mutex = threading.Lock()
+
+    def get(self, key):
+        with self.mutex:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def set(self, key, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self.mutex:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
 @ComputePluginFactory.export("ClipTextEmbeddingFeature")
 class ClipTextEmbeddingFeature(
     ComputePlugin, config=default_config, parameters=default_parameters, version="0.4"
@@ -25,7 +53,10 @@ class ClipTextEmbeddingFeature(
         self.model_name = self.config.get("model", "xlm-roberta-base-ViT-B-32")
         self.pretrained = self.config.get("pretrained")
         self.embedding_size = self.config.get("embedding_size", 768)
+        self.batch_size = self.config.get("batch_size", 256)
+        self.cache_size = self.config.get("cache_size", 4096)
         self.model = None
+        self.embedding_cache = None
 
     def call(self, plugin_run: common_pb2.PluginRun):
         from sklearn.preprocessing import normalize
@@ -50,13 +81,41 @@ class ClipTextEmbeddingFeature(
             self.tokenizer = open_clip.get_tokenizer(self.model_name)
             self.model = model
 
-        result = analyser_pb2.AnalyseReply()
-        for entry in inputs["text"]:
+        # the cache is created here, because the plugin is pickled for the inference server
+        if self.embedding_cache is None:
+            self.embedding_cache = EmbeddingLRUCache(self.cache_size)
+
+        texts = [normalize_text(entry["content"]) for entry in inputs.get("text", [])]
+
+        # only texts without a cached embedding are send to the model, duplicates in
+        # the request are encoded once
+        embeddings = {}
+        missing_texts = []
+        for text in texts:
+            if text in embeddings:
+                continue
+            embedding = self.embedding_cache.get((self.model_name, text))
+            if embedding is None:
+                embeddings[text] = None
+                missing_texts.append(text)
+            else:
+                embeddings[text] = embedding
+
+        for batch_start in range(0, len(missing_texts), self.batch_size):
+            batch = missing_texts[batch_start : batch_start + self.batch_size]
             with torch.no_grad(), torch.amp.autocast(device):
-                text = self.tokenizer(entry["content"])
-                output = self.model.encode_text(text.to(device)).float()
-            output = output / np.linalg.norm(np.asarray(output))
-            output = output.flatten()
+                tokens = self.tokenizer(batch)
+                outputs = self.model.encode_text(tokens.to(device)).float()
+            outputs = outputs.cpu().numpy()
+            outputs = outputs / np.linalg.norm(outputs, axis=-1, keepdims=True)
+
+            for text, output in zip(batch, outputs):
+                embeddings[text] = output
+                self.embedding_cache.set((self.model_name, text), output)
+
+        result = analyser_pb2.AnalyseReply()
+        for text in texts:
+            output = embeddings[text].flatten()
             data = data_pb2.Data(
                 id=uuid.uuid4().hex,
                 name="clip_embedding",
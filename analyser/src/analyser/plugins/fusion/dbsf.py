@@ -0,0 +1,26 @@
+import numpy as np
+
+from analyser.plugins import FusionPlugin, FusionFactory
+
+
+@FusionFactory.export("dbsf")
+class DistributionBasedScoreFusion(FusionPlugin, version="0.1"):
+    server_fusion = "dbsf"
+
+    def __init__(self, **kwargs):
+        super(DistributionBasedScoreFusion, self).__init__(**kwargs)
+
+    def call(self, scores, weights):
+        # scale every list with mean +- 3 standard deviations to [0, 1]
+        results = []
+        for s, w in zip(scores, weights):
+            if len(s) == 0:
+                results.append(s)
+                continue
+            std = np.std(s)
+            if std < 1e-8:
+                results.append(np.full_like(s, 0.5 * w))
+                continue
+            lower = np.mean(s) - 3 * std
+            results.append(np.clip((s - lower) / (6 * std), 0.0, 1.0) * w)
+        return results
@@ -0,0 +1,26 @@
+import numpy as np
+
+from analyser.plugins import FusionPlugin, FusionFactory
+
+default_config = {"k": 60}
+
+
+@FusionFactory.export("rrf")
+class ReciprocalRankFusion(FusionPlugin, config=default_config, version="0.1"):
+    server_fusion = "rrf"
+
+    def __init__(self, **kwargs):
+        super(ReciprocalRankFusion, self).__init__(**kwargs)
+
+    def call(self, scores, weights):
+        results = []
+        for s, w in zip(scores, weights):
+            ranks = np.empty(len(s), dtype=np.float32)
+            ranks[np.argsort(-s, kind="stable")] = np.arange(1, len(s) + 1)
+            # weighted like qdrant, which divides the rank by the weight, so local
+            # and server fusion give the same scores
+            if w <= 0:
+                results.append(np.zeros(len(s), dtype=np.float32))
+                continue
+            results.append(1 / (ranks / w + self.config.get("k")))
+        return results
@@ -0,0 +1,14 @@
+import numpy as np
+
+from analyser.plugins import FusionPlugin, FusionFactory
+
+
+@FusionFactory.export("weighted")
+class WeightedScoreFusion(FusionPlugin, version="0.1"):
+    def __init__(self, **kwargs):
+        super(WeightedScoreFusion, self).__init__(**kwargs)
+
+    def call(self, scores, weights):
+        # weighted mean of the scores, a missing entry counts as 0
+        normalization = max(np.sum(np.abs(weights)), 1e-8)
+        return [s * w / normalization for s, w in zip(scores, weights)]
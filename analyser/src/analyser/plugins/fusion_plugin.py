@@ -0,0 +1,69 @@
+import os
+from typing import List, Dict
+
+import numpy as np
+import numpy.typing as npt
+
+from analyser.utils.plugin.factory import Factory
+from analyser.utils.plugin.plugin import Plugin
+
+
+class FusionPlugin(Plugin):
+    """Merges several ranked result lists into a single ranking.
+
+    Only ids and scores are fused, the payload of the final top-k is loaded
+    afterwards. Indexers that can fuse results on the server check
+    ``server_fusion`` and use the plugin only as fallback.
+    """
+
+    # name of the equivalent fusion method of the indexer (e.g. "rrf" in qdrant)
+    server_fusion = None
+
+    def __init__(self, **kwargs):
+        super(FusionPlugin, self).__init__(**kwargs)
+
+    def __call__(
+        self, results: List[List[Dict]], weights: List[float] = None, size=100
+    ) -> List[Dict]:
+        if weights is None:
+            weights = [1.0] * len(results)
+
+        ids = [x["id"] for result in results for x in result]
+        if len(ids) == 0:
+            return []
+
+        contributions = self.call(
+            [
+                np.asarray([x["score"] for x in result], dtype=np.float32)
+                for result in results
+            ],
+            np.asarray(weights, dtype=np.float32),
+        )
+
+        # sum up the contributions of all lists for each id
+        unique_ids, inverse = np.unique(np.asarray(ids), return_inverse=True)
+        fused = np.bincount(
+            inverse, weights=np.concatenate(contributions), minlength=len(unique_ids)
+        )
+
+        order = np.argsort(-fused, kind="stable")
+        if size < len(order):
+            top_k = np.argpartition(-fused, size - 1)[:size]
+            order = top_k[np.argsort(-fused[top_k], kind="stable")]
+
+        return [{"id": str(unique_ids[i]), "score": float(fused[i])} for i in order]
+
+    def call(
+        self, scores: List[npt.NDArray], weights: npt.NDArray
+    ) -> List[npt.NDArray]:
+        """Returns the contribution of every entry of each list to the fused score"""
+        raise NotImplementedError
+
+
+class FusionFactory(
+    Factory,
+    plugins_path=os.path.join(os.path.abspath(os.path.dirname(__file__)), "fusion"),
+    plugin_import_path="analyser.plugins.fusion",
+    plugin_cls=FusionPlugin,
+):
+    pass
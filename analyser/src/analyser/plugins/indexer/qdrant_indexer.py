@@ -1,42 +1,75 @@
+import re
 import uuid
 import logging
+from fnmatch import fnmatch
 from typing import List, Dict
 
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 
 import numpy as np
 
-from analyser.plugins import IndexerPlugin, IndexerFactory
-from analyser.utils import get_element
+from analyser.plugins import IndexerPlugin, IndexerFactory, FusionFactory
 
 default_config = {
     "index_type": "cos",
-    "host": "localhost",
+    "host": "qdrant",
     "port": 6333,
-    "grpc": {"port": 50151, "host": "localhost"},
+    # seconds, timeout of searches and of all other calls
+    "search_timeout": 30,
+    "timeout": 120,
+    "grpc": {
+        "prefer": True,
+        "port": 6334,
+        # channels shared by all threads, calls are distributed round robin
+        "pool_size": 4,
+        "keepalive_time_ms": 30000,
+        "keepalive_timeout_ms": 10000,
+        "max_message_mb": 64,
+    },
 }
 
 default_version = 0.1
 
 
 @IndexerFactory.export("QDrantIndexer")
-class QDrantIndexer(IndexerPlugin):
+class QDrantIndexer(IndexerPlugin, config=default_config):
     def __init__(self, **kwargs):
         super(QDrantIndexer, self).__init__(**kwargs)
 
-        self.port = get_element(self.config, "port")
-        if self.port is None:
-            self.port = 50151
-
-        self.host = get_element(self.config, "host")
-        if self.host is None:
-            self.host = "localhost"
-        # Read configs
-        logging.info(f"[QDrantIndexer] Connection opened")
-        self.client = QdrantClient(
-            host="qdrant", port=6333, timeout=120, grpc_port=6334, prefer_grpc=False
-        )
+        self.search_timeout = self.config.get("search_timeout")
+        # payload fields with a full text index
+        self.text_fields = set()
+
+        logging.info(f"[QDrantIndexer] Connection opened {self.client_args()}")
+        self.client = QdrantClient(**self.client_args())
+        # created on first use inside the event loop of the aio server
+        self.async_client = None
+
+    def client_args(self) -> Dict:
+        grpc_config = {**default_config["grpc"], **self.config.get("grpc", {})}
+        max_message_length = grpc_config.get("max_message_mb") * 1024 * 1024
+
+        return {
+            "host": self.config.get("host"),
+            "port": self.config.get("port"),
+            "grpc_port": grpc_config.get("port"),
+            "prefer_grpc": grpc_config.get("prefer"),
+            "timeout": self.config.get("timeout"),
+            "pool_size": grpc_config.get("pool_size"),
+            "grpc_options": {
+                "grpc.keepalive_time_ms": grpc_config.get("keepalive_time_ms"),
+                "grpc.keepalive_timeout_ms": grpc_config.get("keepalive_timeout_ms"),
+                "grpc.keepalive_permit_without_calls": 1,
+                "grpc.max_send_message_length": max_message_length,
+                "grpc.max_receive_message_length": max_message_length,
+            },
+        }
+
+    def get_async_client(self) -> AsyncQdrantClient:
+        if self.async_client is None:
+            self.async_client = AsyncQdrantClient(**self.client_args())
+        return self.async_client
 
     def get_collection_indexes(self, name: str = None):
         logging.info(f"[QDrantIndexer]: get_collection_indexes")
@@ -83,19 +116,64 @@ class QDrantIndexer(IndexerPlugin):
         if not result:
             logging.error("[QDrantIndexer::create_collection] error")
 
+    def get_payload_indexes(self, collection_name) -> Dict[str, str]:
+        try:
+            collection_info = self.client.get_collection(collection_name)
+        except Exception as e:
+            logging.error(f"[QDrantIndexer::get_payload_indexes] {e}")
+            return {}
+
+        # keys with special characters are quoted in the schema
+        payload_indexes = {
+            k.strip('"'): str(
+                v.data_type.value if hasattr(v.data_type, "value") else v.data_type
+            )
+            for k, v in (collection_info.payload_schema or {}).items()
+        }
+        self.text_fields.update(k for k, v in payload_indexes.items() if v == "text")
+        return payload_indexes
+
+    def create_payload_index(
+        self, collection_name, field: str, type: str, params: Dict = None
+    ) -> None:
+        if type == "text":
+            # full text fields are searched by their tokens instead of exact values
+            field_schema = models.TextIndexParams(
+                type=models.TextIndexType.TEXT,
+                **{
+                    "tokenizer": models.TokenizerType.WORD,
+                    "lowercase": True,
+                    **(params or {}),
+                },
+            )
+            self.text_fields.add(field)
+        else:
+            field_schema = models.PayloadSchemaType(type)
+
+        self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name=f'"{field}"',
+            field_schema=field_schema,
+            wait=True,
+        )
+
+    def delete_payload_index(self, collection_name, field: str) -> None:
+        self.text_fields.discard(field)
+        self.client.delete_payload_index(
+            collection_name=collection_name, field_name=f'"{field}"', wait=True
+        )
+
     def delete_collection(self, collection_name):
         # TODO add lock here
         logging.info(f"[QDrantIndexer]: delete_collection")
 
         return self.client.delete_collection(collection_name=collection_name)
 
-    def add_points(self, collection_name, points: List[Dict]):
+    def add_points(self, collection_name, points: List[Dict], wait: bool = True):
         # TODO add lock here
-        logging.info(f"[QDrantIndexer]: add_points")
-        # for k, v in points[0].get("features", {}).items():
-        #     logging.error(f"{k}, {len(v)}, {v}")
-        logging.info(f"X: {[x.get('meta', {}) for x in points]}")
-        result = self.client.upsert(
+        logging.debug(f"[QDrantIndexer]: add_points {len(points)}")
+
+        self.client.upsert(
             collection_name=collection_name,
             points=[
                 models.PointStruct(
@@ -105,85 +183,239 @@ class QDrantIndexer(IndexerPlugin):
                 )
                 for x in points
             ],
+            wait=wait,
         )
 
-    def search(self, queries, filters, size=100):
-        results = []
+    def payload_selector(self, payload_fields=None):
+        if payload_fields is None:
+            return False
+        # patterns can't be expressed as payload selector, they are filtered afterwards
+        if any(re.search(r"[*?\[]", x) for x in payload_fields):
+            return True
+        # keys are quoted like in build_condition, so "/" or "." aren't nested paths
+        return models.PayloadSelectorInclude(include=[f'"{x}"' for x in payload_fields])
 
-        must = [
-            models.FieldCondition(
-                key=f'"{f["field"]}"', match=models.MatchValue(value=f["query"])
-            )
-            for f in filters
-            if f["flag"] == "MUST"
-        ]
+    def point_to_result(
+        self, point, score=None, payload_fields=None, with_vectors=False
+    ):
+        result = {
+            "id": uuid.UUID(point.id).hex,
+            "score": point.score if score is None else score,
+        }
+        if payload_fields is not None:
+            result["meta"] = {
+                k: v
+                for k, v in (point.payload or {}).items()
+                if any(fnmatch(k, x) for x in payload_fields)
+            }
+        if with_vectors:
+            result["features"] = point.vector
+        return result
+
+    def build_condition(self, f) -> models.FieldCondition:
+        if f["field"] in self.text_fields:
+            match = models.MatchText(text=f["query"])
+        else:
+            match = models.MatchValue(value=f["query"])
+        return models.FieldCondition(key=f'"{f["field"]}"', match=match)
+
+    def build_filter(self, filters) -> models.Filter:
+        must = [self.build_condition(f) for f in filters if f["flag"] == "MUST"]
         if len(must) == 0:
             must = None
-        should = [
-            models.FieldCondition(
-                key=f'"{f["field"]}"', match=models.MatchValue(value=f["query"])
-            )
-            for f in filters
-            if f["flag"] == "SHOULD"
-        ]
+        should = [self.build_condition(f) for f in filters if f["flag"] == "SHOULD"]
         if len(should) == 0:
             should = None
-        must_not = [
-            models.FieldCondition(
-                key=f'"{f["field"]}"', match=models.MatchValue(value=f["query"])
-            )
-            for f in filters
-            if f["flag"] == "NOT"
-        ]
+        must_not = [self.build_condition(f) for f in filters if f["flag"] == "NOT"]
         if len(must_not) == 0:
             must_not = None
 
-        if len(queries) == 0:
-            result = self.client.scroll(
-                collection_name="default",
-                scroll_filter=models.Filter(
-                    must=must, should=should, must_not=must_not
-                ),
-                limit=size,
-                with_payload=True,
-                with_vectors=True,
-            )
+        return models.Filter(must=must, should=should, must_not=must_not)
 
-            count = 0
-            for x in result[0]:
-                results.append(
-                    {
-                        "id": uuid.UUID(x.id).hex,
-                        "meta": x.payload,
-                        "score": 1,
-                        "features": [],
-                    }
+    def server_query(self, fusion, weights):
+        if fusion.server_fusion == "rrf":
+            # qdrant ranks from 0, so k + 1 gives the same scores as the local rrf
+            return models.RrfQuery(
+                rrf=models.Rrf(
+                    k=fusion.config.get("k") + 1,
+                    weights=weights if len(set(weights)) > 1 else None,
                 )
-                count += 1
-
-        for i, q in enumerate(queries):
-            result = self.client.query_points(
-                collection_name="default",
-                query=q["value"],
-                using=q["index_name"],
-                # query=models.NamedVector(name=q["index_name"], vector=q["value"]),
-                query_filter=models.Filter(must=must, should=should, must_not=must_not),
-                limit=size,
-                with_payload=True,
-                with_vectors=True,
             )
-            count = 0
-            for x in result.points:
-                results.append(
-                    {
-                        "id": uuid.UUID(x.id).hex,
-                        "meta": x.payload,
-                        "score": x.score * q.get("weight", 1.0),
-                        "features": [],
-                    }
+        return models.FusionQuery(fusion=models.Fusion(fusion.server_fusion))
+
+    def search_calls(
+        self,
+        queries,
+        filters,
+        size=100,
+        fusion=None,
+        payload_fields=None,
+        with_vectors=False,
+    ):
+        """Generator with the steps of a search shared by search and search_async.
+
+        It yields the (method, kwargs) of each client call, receives the response
+        and returns the results, so only the calls differ between both clients.
+        """
+        query_filter = self.build_filter(filters)
+        with_payload = self.payload_selector(payload_fields)
+
+        if len(queries) == 0:
+            result = yield "scroll", {
+                "collection_name": "default",
+                "scroll_filter": query_filter,
+                "limit": size,
+                "with_payload": with_payload,
+                "with_vectors": with_vectors,
+                "timeout": self.search_timeout,
+            }
+
+            return [
+                self.point_to_result(
+                    x,
+                    score=1,
+                    payload_fields=payload_fields,
+                    with_vectors=with_vectors,
                 )
-                count += 1
+                for x in result[0]
+            ]
 
-        results = sorted(results, key=lambda x: -x["score"])
+        if fusion is None:
+            fusion = FusionFactory().build("weighted")
 
-        return results
+        weights = [q.get("weight", 1.0) for q in queries]
+
+        # qdrant only weights rrf, other fusions with different weights are local
+        if (
+            len(queries) > 1
+            and fusion.server_fusion is not None
+            and (fusion.server_fusion == "rrf" or len(set(weights)) == 1)
+        ):
+            response = yield "query_points", {
+                "collection_name": "default",
+                "prefetch": [
+                    models.Prefetch(
+                        query=q["value"],
+                        using=q["index_name"],
+                        filter=query_filter,
+                        limit=size,
+                    )
+                    for q in queries
+                ],
+                "query": self.server_query(fusion, weights),
+                "limit": size,
+                "with_payload": with_payload,
+                "with_vectors": with_vectors,
+                "timeout": self.search_timeout,
+            }
+
+            return [
+                self.point_to_result(
+                    x, payload_fields=payload_fields, with_vectors=with_vectors
+                )
+                for x in response.points
+            ]
+
+        # all indexes are queried with a single batch request, so the latency is
+        # bounded by the slowest index instead of the sum over all of them
+        responses = yield "query_batch_points", {
+            "collection_name": "default",
+            "requests": [
+                models.QueryRequest(
+                    query=q["value"],
+                    using=q["index_name"],
+                    filter=query_filter,
+                    limit=size,
+                    with_payload=False,
+                    with_vector=False,
+                )
+                for q in queries
+            ],
+            "timeout": self.search_timeout,
+        }
+
+        results = fusion(
+            [
+                [self.point_to_result(x) for x in response.points]
+                for response in responses
+            ],
+            weights=weights,
+            size=size,
+        )
+
+        if payload_fields is None and not with_vectors:
+            return results
+
+        # the payload is only requested for the final top-k
+        points = yield "retrieve", {
+            "collection_name": "default",
+            "ids": [x["id"] for x in results],
+            "with_payload": with_payload,
+            "with_vectors": with_vectors,
+            "timeout": self.search_timeout,
+        }
+        points = {uuid.UUID(x.id).hex: x for x in points}
+
+        return [
+            self.point_to_result(
+                points[x["id"]],
+                score=x["score"],
+                payload_fields=payload_fields,
+                with_vectors=with_vectors,
+            )
+            for x in results
+            if x["id"] in points
+        ]
+
+    def search(
+        self,
+        queries,
+        filters,
+        size=100,
+        fusion=None,
+        payload_fields=None,
+        with_vectors=False,
+    ):
+        calls = self.search_calls(
+            queries,
+            filters,
+            size=size,
+            fusion=fusion,
+            payload_fields=payload_fields,
+            with_vectors=with_vectors,
+        )
+        try:
+            method, call_kwargs = next(calls)
+            while True:
+                response = getattr(self.client, method)(**call_kwargs)
+                method, call_kwargs = calls.send(response)
+        except StopIteration as e:
+            return e.value
+
+    async def search_async(
+        self,
+        queries,
+        filters,
+        size=100,
+        fusion=None,
+        payload_fields=None,
+        with_vectors=False,
+    ):
+        # same as search, but with the async client of the aio server
+        client = self.get_async_client()
+
+        calls = self.search_calls(
+            queries,
+            filters,
+            size=size,
+            fusion=fusion,
+            payload_fields=payload_fields,
+            with_vectors=with_vectors,
+        )
+        try:
+            method, call_kwargs = next(calls)
+            while True:
+                response = await getattr(client, method)(**call_kwargs)
+                method, call_kwargs = calls.send(response)
+        except StopIteration as e:
+            return e.value
@@ -1,5 +1,9 @@
 import os
+import time
+import asyncio
 import logging
+import threading
+from concurrent import futures
 from dataclasses import dataclass
 from typing import List, Dict
 
@@ -7,6 +11,15 @@ from analyser.utils.plugin.factory import Factory
 from analyser.utils.plugin.plugin import Plugin
 from analyser.plugins.compute_plugin import ComputePluginManager
 
+PAYLOAD_INDEX_TYPES = ["keyword", "integer", "float", "bool", "geo", "text", "datetime"]
+
+default_upsert_config = {
+    "batch_size": 256,
+    "max_delay": 1.0,
+    "num_workers": 4,
+    "max_retries": 3,
+}
+
 
 class IndexerPlugin(Plugin):
     def __init__(self, **kwargs):
@@ -15,9 +28,38 @@ class IndexerPlugin(Plugin):
     def indexing(self, train_entries, index_entries):
         pass
 
-    def search(self, queries, size=100):
+    def get_payload_indexes(self, collection_name) -> Dict[str, str]:
+        """Returns the type of every indexed payload field"""
+        return {}
+
+    def create_payload_index(
+        self, collection_name, field: str, type: str, params: Dict = None
+    ) -> None:
         pass
 
+    def delete_payload_index(self, collection_name, field: str) -> None:
+        pass
+
+    def search(
+        self,
+        queries,
+        filters,
+        size=100,
+        fusion=None,
+        payload_fields=None,
+        with_vectors=False,
+    ):
+        """Returns a list of hits with id and score.
+
+        Only if requested, a hit also contains the payload fields matching
+        `payload_fields` as `meta` and the vectors as `features`.
+        """
+        pass
+
+    async def search_async(self, *args, **kwargs):
+        # indexers without an async client block a worker thread of the event loop
+        return await asyncio.to_thread(self.search, *args, **kwargs)
+
 
 class IndexerFactory(
     Factory,
@@ -100,6 +142,7 @@ class IndexerPluginManager:
                 name=index.get("name"),
                 indexes=target_index_configuration,
             )
+            self.init_payload_indexes(indexer_plugin, index)
             return
 
         # check if the existing index is compatible with the target index from the config
@@ -128,6 +171,51 @@ class IndexerPluginManager:
             # TODO fix
             exit(-1)
 
+        self.init_payload_indexes(indexer_plugin, index)
+
+    def init_payload_indexes(self, indexer_plugin, index):
+        # payload fields that are used in filters, e.g. for faceted search
+        target_payload_indexes = {}
+        for payload_index in index.get("payload_index", []):
+            field = payload_index.get("field")
+            field_type = payload_index.get("type")
+            if field_type not in PAYLOAD_INDEX_TYPES:
+                logging.error(
+                    f'Payload index "{field}" has an unknown type "{field_type}" ({", ".join(PAYLOAD_INDEX_TYPES)}).'
+                )
+                continue
+            target_payload_indexes[field] = payload_index
+
+        current_payload_indexes = indexer_plugin.get_payload_indexes(index.get("name"))
+
+        for field, payload_index in target_payload_indexes.items():
+            field_type = payload_index.get("type")
+            if current_payload_indexes.get(field) == field_type:
+                continue
+
+            # an index with a different type is replaced
+            if field in current_payload_indexes:
+                logging.info(
+                    f'Replace payload index "{field}" ({current_payload_indexes[field]} -> {field_type})'
+                )
+                indexer_plugin.delete_payload_index(index.get("name"), field)
+
+            logging.info(f'Create payload index "{field}" ({field_type})')
+            try:
+                indexer_plugin.create_payload_index(
+                    index.get("name"),
+                    field,
+                    field_type,
+                    params=payload_index.get("params"),
+                )
+            except Exception as e:
+                logging.error(f'Could not create payload index "{field}": {e}')
+
+        for field in current_payload_indexes.keys() - target_payload_indexes.keys():
+            logging.warning(
+                f'Payload index "{field}" of collection "{index.get("name")}" is not in the configuration'
+            )
+
     def check_and_init_indexes(self):
         # Build an dict with index name to indexer plugin and config
         self.indexes = {}
@@ -215,9 +303,9 @@ class IndexerPluginManager:
 
         return PayloadMapping(fields=collection_config.get("payload_fields", []))
 
-    def add_points(self, collection_name, points: List[Dict]):
+    def add_points(self, collection_name, points: List[Dict], wait: bool = True):
         # TODO add lock here
-        logging.info(f"[IndexerPluginManager]: add_points")
+        logging.debug(f"[IndexerPluginManager]: add_points")
 
         if collection_name not in self.indexes:
             logging.error(
@@ -227,7 +315,9 @@ class IndexerPluginManager:
 
         indexer_plugin = self.indexes[collection_name]["indexer_plugin"]
 
-        indexer_plugin.add_points(collection_name=collection_name, points=points)
+        indexer_plugin.add_points(
+            collection_name=collection_name, points=points, wait=wait
+        )
 
     def delete_collection(
         self,
@@ -261,9 +351,145 @@ class IndexerPluginManager:
 
         if collection_name not in self.indexes:
             logging.error(
-                "[IndexerPluginManager::search] Unknown collection '{collection_name}'"
+                f"[IndexerPluginManager::search] Unknown collection '{collection_name}'"
             )
             return None
 
         results = self.indexes[collection_name]["indexer_plugin"].search(**kwargs)
         return results
+
+    async def search_async(
+        self,
+        collection_name=None,
+        **kwargs,
+    ):
+        logging.info(f"[IndexerPluginManager]: search_async {collection_name}")
+
+        if collection_name not in self.indexes:
+            logging.error(
+                f"[IndexerPluginManager::search_async] Unknown collection '{collection_name}'"
+            )
+            return None
+
+        return await self.indexes[collection_name]["indexer_plugin"].search_async(
+            **kwargs
+        )
+
+
+class UpsertBatcher:
+    """Collects points and writes them to an index in batches.
+
+    A batch is sent when it has `batch_size` points or its oldest point is older
+    than `max_delay` seconds, a background thread also sends it if no more points
+    are added. `num_workers` threads send the batches without waiting for the
+    indexer to apply them and retry failed ones. The last full batch is kept until
+    more points arrive, so close() waits for all batches and sends the remaining
+    points with wait=True.
+    """
+
+    def __init__(
+        self,
+        indexer_plugin_manager: IndexerPluginManager,
+        collection_name: str,
+        config: Dict = None,
+    ):
+        self.indexer_plugin_manager = indexer_plugin_manager
+        self.collection_name = collection_name
+
+        config = {**default_upsert_config, **(config or {})}
+        self.batch_size = config.get("batch_size")
+        self.max_delay = config.get("max_delay")
+        self.max_retries = config.get("max_retries")
+
+        self.pool = futures.ThreadPoolExecutor(max_workers=config.get("num_workers"))
+        self.futures = []
+        self.points = []
+        self.first_added = None
+        self.num_failed = 0
+        self.lock = threading.Lock()
+
+        self.closed = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_expired_loop, daemon=True)
+        self.flusher.start()
+
+    def __enter__(self) -> "UpsertBatcher":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+    def add(self, points: List[Dict]) -> None:
+        with self.lock:
+            if len(self.points) == 0:
+                self.first_added = time.monotonic()
+            self.points.extend(points)
+
+            while len(self.points) > self.batch_size:
+                self.send(self.points[: self.batch_size])
+                self.points = self.points[self.batch_size :]
+                self.first_added = time.monotonic()
+
+        self.flush_expired()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.send_pending()
+
+    def flush_expired(self) -> None:
+        with self.lock:
+            if (
+                len(self.points) > 0
+                and time.monotonic() - self.first_added > self.max_delay
+            ):
+                self.send_pending()
+
+    def flush_expired_loop(self) -> None:
+        # a partial batch must not wait for the next add
+        while not self.closed.wait(self.max_delay / 2):
+            self.flush_expired()
+
+    def send_pending(self) -> None:
+        # has to be called with the lock held
+        if len(self.points) > 0:
+            self.send(self.points)
+            self.points = []
+
+    def send(self, points: List[Dict]) -> None:
+        # has to be called with the lock held
+        self.futures = [x for x in self.futures if not x.done()]
+        self.futures.append(self.pool.submit(self.upsert, points, False))
+
+    def upsert(self, points: List[Dict], wait: bool) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.indexer_plugin_manager.add_points(
+                    self.collection_name, points, wait=wait
+                )
+                return True
+            except Exception as e:
+                logging.warning(
+                    f"[UpsertBatcher] Upsert of {len(points)} points failed (attempt {attempt + 1}): {repr(e)}"
+                )
+                if attempt < self.max_retries:
+                    time.sleep(min(2**attempt * 0.5, 10))
+
+        logging.error(f"[UpsertBatcher] Dropped {len(points)} points")
+        with self.lock:
+            self.num_failed += len(points)
+        return False
+
+    def close(self) -> int:
+        """Sends all remaining points and returns the number of points that failed"""
+        self.closed.set()
+        self.flusher.join()
+
+        futures.wait(self.futures)
+        self.futures = []
+
+        # the final write waits until the indexer has applied all points
+        if len(self.points) > 0:
+            self.upsert(self.points, True)
+            self.points = []
+
+        self.pool.shutdown()
+        return self.num_failed
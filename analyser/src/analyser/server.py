@@ -1,10 +1,12 @@
 import grpc
 import sys
+import asyncio
 import time
 import tomllib
 
 import argparse
 import logging
+import traceback
 
 from interface import (
     analyser_pb2_grpc,
@@ -17,14 +19,27 @@ from concurrent import futures
 from shared_object import SharedObject
 from plugins import IndexerPluginManager
 
-from services import AnalyserServicer, CollectionServicer, SearcherServicer
+from services import (
+    AnalyserServicer,
+    CollectionServicer,
+    SearcherServicer,
+    AsyncAnalyserServicer,
+    AsyncCollectionServicer,
+    AsyncSearcherServicer,
+)
 from inference import InferenceServerManager
 from plugins import ComputePluginManager
 from plugins.cache import Cache
+from jobs.hydration import ResultHydrator
 from data import DataManager
 from database.filesystem_database import FilesystemCollectionDatabase
 from database.valkey_database import CollectionDatabase, ValkeyCollectionRegister
 
+server_options = [
+    ("grpc.max_send_message_length", 200 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 200 * 1024 * 1024),
+]
+
 
 class Server:
     def __init__(self, config):
@@ -42,15 +57,17 @@ class Server:
 
         data_config = config.get("data", None)
         data_dir = None
+        store_config = None
         if data_config is not None:
             data_dir = data_config.get("path", None)
+            store_config = data_config.get("store")
             cache_config = data_config.get("cache")
             if cache_config is not None:
                 cache = CacheManager.build(
                     name=cache_config["type"], config=cache_config["params"]
                 )
 
-        data_manager = DataManager(data_dir=data_dir, cache=cache)
+        data_manager = DataManager(data_dir=data_dir, cache=cache, store=store_config)
 
         collection_database = CollectionDatabase(
             ValkeyCollectionRegister(), data_manager
@@ -63,60 +80,118 @@ class Server:
             indexer_plugin_manager=indexer_plugin_manager,
             data_manager=data_manager,
             collection_database=collection_database,
+            hydrator=ResultHydrator(
+                data_manager, config=config.get("search", {}).get("hydration")
+            ),
         )
 
-        self.indexer_servicer = AnalyserServicer(config, self.shared_object)
-        self.collection_servicer = CollectionServicer(config, self.shared_object)
-        self.searcher_servicer = SearcherServicer(config, self.shared_object)
+        self.grpc_config = config.get("grpc", {})
+        self.mode = self.grpc_config.get("mode", "sync")
 
-        self.server = grpc.server(
-            futures.ThreadPoolExecutor(max_workers=10),
-            options=[
-                ("grpc.max_send_message_length", 200 * 1024 * 1024),
-                ("grpc.max_receive_message_length", 200 * 1024 * 1024),
-            ],
-        )
+        if self.mode == "aio":
+            self.indexer_servicer = AsyncAnalyserServicer(config, self.shared_object)
+            self.collection_servicer = AsyncCollectionServicer(
+                config, self.shared_object
+            )
+            self.searcher_servicer = AsyncSearcherServicer(config, self.shared_object)
+        else:
+            self.indexer_servicer = AnalyserServicer(config, self.shared_object)
+            self.collection_servicer = CollectionServicer(config, self.shared_object)
+            self.searcher_servicer = SearcherServicer(config, self.shared_object)
+
+        logging.info("Start all inference servers")
+        inference_server_manager.start()
 
+    def add_servicers(self, server):
         searcher_pb2_grpc.add_SearcherServicer_to_server(
             self.searcher_servicer,
-            self.server,
+            server,
         )
 
         analyser_pb2_grpc.add_AnalyserServicer_to_server(
             self.indexer_servicer,
-            self.server,
+            server,
         )
 
         collection_pb2_grpc.add_CollectionServicer_to_server(
             self.collection_servicer,
-            self.server,
+            server,
         )
 
-        grpc_config = config.get("grpc", {})
-        port = grpc_config.get("port", 50051)
-        self.server.add_insecure_port(f"[::]:{port}")
+        port = self.grpc_config.get("port", 50051)
+        server.add_insecure_port(f"[::]:{port}")
 
-        logging.info("Start all inference servers")
-        inference_server_manager.start()
+        return server
+
+    def log_jobs(self):
+        for name, servicer in [
+            ("analyser", self.indexer_servicer),
+            ("collection", self.collection_servicer),
+            ("searcher", self.searcher_servicer),
+        ]:
+            logging.info(f"[Server] {name} jobs: {servicer.jobs.stats()}")
+
+    def compact_data(self):
+        # removes deleted packets from the segments of the data store, a failed
+        # compaction is retried with the next run
+        try:
+            num_bytes = self.shared_object.data_manager.compact()
+        except Exception as e:
+            logging.error(f"[Server::compact_data] {repr(e)}")
+            logging.error(traceback.format_exc())
+            return
+
+        if num_bytes > 0:
+            logging.info(f"[Server] {num_bytes} bytes of deleted data freed")
 
     def run(self):
+        if self.mode == "aio":
+            asyncio.run(self.run_async())
+            return
+
+        self.server = self.add_servicers(
+            grpc.server(
+                futures.ThreadPoolExecutor(
+                    max_workers=self.grpc_config.get("max_workers", 10)
+                ),
+                options=server_options,
+            )
+        )
         self.server.start()
         logging.info("[Server] Ready")
 
         try:
             while True:
-                num_jobs = len(self.indexer_servicer.futures)
-                num_jobs_done = len(
-                    [x for x in self.indexer_servicer.futures if x["future"].done()]
-                )
-                logging.info(
-                    f"[Server] num_jobs:{num_jobs} num_jobs_done:{num_jobs_done}"
-                )
+                self.log_jobs()
+                self.compact_data()
 
                 time.sleep(60 * 60)
         except KeyboardInterrupt:
             self.server.stop(0)
 
+    async def run_async(self):
+        # the aio server has to be created inside the running event loop, handlers
+        # that aren't coroutines run in the migration thread pool
+        self.server = self.add_servicers(
+            grpc.aio.server(
+                migration_thread_pool=futures.ThreadPoolExecutor(
+                    max_workers=self.grpc_config.get("max_workers", 10)
+                ),
+                options=server_options,
+            )
+        )
+        await self.server.start()
+        logging.info("[Server] Ready (aio)")
+
+        try:
+            while True:
+                self.log_jobs()
+                await asyncio.to_thread(self.compact_data)
+
+                await asyncio.sleep(60 * 60)
+        finally:
+            await self.server.stop(0)
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Indexing a set of images")
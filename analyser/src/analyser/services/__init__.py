@@ -1,3 +1,3 @@
-from .analyser import AnalyserServicer
-from .collection import CollectionServicer
-from .searcher import SearcherServicer
+from .analyser import AnalyserServicer, AsyncAnalyserServicer
+from .collection import CollectionServicer, AsyncCollectionServicer
+from .searcher import SearcherServicer, AsyncSearcherServicer
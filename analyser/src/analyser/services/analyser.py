@@ -4,6 +4,7 @@ import logging
 from concurrent import futures
 
 from interface import analyser_pb2, analyser_pb2_grpc
+from analyser.jobs.registry import JobRegistry
 
 
 class AnalyserServicer(analyser_pb2_grpc.AnalyserServicer):
@@ -18,7 +19,7 @@ class AnalyserServicer(analyser_pb2_grpc.AnalyserServicer):
         # self.search_process_pool = futures.ProcessPoolExecutor(
         #     max_workers=8, initializer=SearchJob().init_worker, initargs=(config,)
         # )
-        self.futures = []
+        self.jobs = JobRegistry(config.get("jobs"))
 
         self.max_results = config.get("indexer", {}).get("max_results", 100)
 
@@ -120,13 +121,12 @@ class AnalyserServicer(analyser_pb2_grpc.AnalyserServicer):
         #     IndexingJob(), copy.deepcopy(variable)
         # )
         # variable["future"] = future
-        # self.futures.append(variable)
+        # self.jobs.submit(job_id, future)
 
     def status(self, request, context):
-        futures_lut = {x["id"]: i for i, x in enumerate(self.futures)}
+        job_data = self.jobs.get(request.id)
 
-        if request.id in futures_lut:
-            job_data = self.futures[futures_lut[request.id]]
+        if job_data is not None:
             done = job_data["future"].done()
 
             if not done:
@@ -187,17 +187,14 @@ class AnalyserServicer(analyser_pb2_grpc.AnalyserServicer):
         }
 
         future = self.search_process_pool.submit(SearchJob(), copy.deepcopy(variable))
-        variable["future"] = future
-        self.futures.append(variable)
+        self.jobs.submit(job_id, future)
 
         return analyser_pb2.SearchReply(id=job_id)
 
     def list_search_result(self, request, context):
-        futures_lut = {x["id"]: i for i, x in enumerate(self.futures)}
-        logging.error(futures_lut)
+        job_data = self.jobs.get(request.id)
 
-        if request.id in futures_lut:
-            job_data = self.futures[futures_lut[request.id]]
+        if job_data is not None:
             done = job_data["future"].done()
 
             if not done:
@@ -225,3 +222,19 @@ class AnalyserServicer(analyser_pb2_grpc.AnalyserServicer):
         context.set_details("Job unknown")
 
         return analyser_pb2.ListSearchResultReply()
+
+
+class AsyncAnalyserServicer(AnalyserServicer):
+    """Analyser for the grpc.aio server, plugin runs are awaited on the event loop"""
+
+    async def analyse(self, request, context):
+        logging.info(f"[AsyncAnalyserServicer::analyse] Request")
+
+        return await self.shared_object.inference_server_manager.call_async(
+            self.shared_object.compute_plugin_manager,
+            request.plugin_run.plugin,
+            request=request.plugin_run,
+        )
+
+    async def status(self, request, context):
+        return super().status(request, context)
@@ -1,13 +1,13 @@
+import asyncio
 import logging
 import uuid
-import copy
 import grpc
 import re
+from fnmatch import fnmatch
 
 from interface import collection_pb2, collection_pb2_grpc
-from jobs import IndexingJob
-import imageio.v3 as iio
-from concurrent import futures
+from analyser.jobs.ingestion import IngestionPipeline
+from analyser.jobs.registry import JobRegistry
 
 
 class CollectionServicer(collection_pb2_grpc.CollectionServicer):
@@ -16,8 +16,7 @@ class CollectionServicer(collection_pb2_grpc.CollectionServicer):
 
         self.shared_object = shared_object
 
-        self.add_points_process_pool = futures.ThreadPoolExecutor()
-        self.futures = []
+        self.jobs = JobRegistry(config.get("jobs"))
 
     def add(self, request, context):
         logging.info(f"Received analyse request, plugins: {request}")
@@ -35,6 +34,9 @@ class CollectionServicer(collection_pb2_grpc.CollectionServicer):
         self.shared_object.indexer_plugin_manager.delete_collection(
             collection_name=request.name,
         )
+        # the points of the collection are unknown here, so all cached data is dropped
+        if self.shared_object.hydrator is not None:
+            self.shared_object.hydrator.clear()
 
         return collection_pb2.CollectionDeleteResponse()
 
@@ -54,105 +56,50 @@ class CollectionServicer(collection_pb2_grpc.CollectionServicer):
         return
 
     def add_points(self, request_iterator, context):
-        logging.info(f"Received analyse request, plugins")
+        logging.info(f"[CollectionServicer::add_points]")
 
         job_id = uuid.uuid4().hex
 
-        point_ids = []
-        collection_name = None
-
-        for data_point in request_iterator:
-            # TODO check if key already exists
-            point_id = data_point.id if data_point.id else uuid.uuid4().hex
-
-            point_ids.append(point_id)
-            collection_name = data_point.collection_name
-
-            with self.shared_object.data_manager.create_data(
-                "ListData", data_id=point_id
-            ) as list_data:
-                for i, data in enumerate(data_point.data):
-                    data_type = data.WhichOneof("data")
-
-                    data_id = data.id if data.id else uuid.uuid4().hex
-
-                    if data_type == "image":
-                        with list_data.create_data(
-                            "ImageData", data.name, data_id=data_id
-                        ) as image_data:
-                            image_data.ext = data.image.ext
-
-                            image = iio.imread(data.image.content)
-                            image_data.save_image(image)
-
-                    elif data_type == "bool":
-                        with list_data.create_data(
-                            "BoolData", data.name, data_id=data_id
-                        ) as bool_data:
-                            bool_data.value = data.bool.value
-
-                    elif data_type == "int":
-                        with list_data.create_data(
-                            "IntData", data.name, data_id=data_id
-                        ) as int_data:
-                            int_data.value = data.int.value
-
-                    elif data_type == "float":
-                        with list_data.create_data(
-                            "FloatData", data.name
-                        ) as float_data:
-                            float_data.value = data.float.value
-
-                    elif data_type == "text":
-                        with list_data.create_data(
-                            "TextData", data.name, data_id=data_id
-                        ) as text_data:
-                            text_data.text = data.text.text
-
-                    elif data_type == "geo":
-                        with list_data.create_data(
-                            "GeoData", data.name, data_id=data_id
-                        ) as geo_data:
-                            geo_data.lat = data.geo.lat
-                            geo_data.lon = data.geo.lon
-
-                    else:
-                        logging.warning(
-                            f"[Collection::add_points] Data type '{data_type}' is not supported."
-                        )
-
-            self.shared_object.collection_database.add_point(list_data)
+        # points are indexed while the stream is still received
+        pipeline = IngestionPipeline(
+            shared_object=self.shared_object,
+            config=self.config.get("ingestion"),
+            indexing_config=self.config.get("indexing"),
+        )
+        self.jobs.submit(job_id, pipeline.future)
 
+        for point_id, status in pipeline(request_iterator):
             yield collection_pb2.AddPointsReply(
-                status="ok", id=data_id, indexing_job_id=job_id
+                status=status, id=point_id, indexing_job_id=job_id
             )
 
-        #
-        variable = {
-            "future": None,
-            "id": job_id,
-            "points_list": point_ids,
-            "collection_name": collection_name,
-        }
-
-        # indexing_job = IndexingJob()
-        # indexing_job.init_worker(self.config)
-        # indexing_job(copy.deepcopy(variable))
-
-        future = self.add_points_process_pool.submit(
-            IndexingJob(shared_object=self.shared_object), copy.deepcopy(variable)
-        )
-        variable["future"] = future
-        self.futures.append(variable)
-
     def get(
         self, request: collection_pb2.GetRequest, context: grpc.ServicerContext
     ) -> collection_pb2.GetResponse:
         response = collection_pb2.GetResponse(id=request.id)
+        # images are returned with their bytes unless the client opts out
+        include_media = (
+            request.include_media if request.HasField("include_media") else True
+        )
         with self.shared_object.data_manager.load(request.id) as list_data:
             for name, data in list_data:
+                # skip fields before they are decoded
+                if len(request.include_fields) > 0 and not any(
+                    fnmatch(name, x) for x in request.include_fields
+                ):
+                    continue
+
+                with data as data:
+                    if data.type == "ImageData":
+                        proto = data.to_proto(
+                            include_media=include_media,
+                            include_thumbnail=request.include_thumbnail,
+                        )
+                    else:
+                        proto = data.to_proto()
+
                 pb_data = response.data.add()
-                pb_data.CopyFrom(data.to_proto())
+                pb_data.CopyFrom(proto)
                 pb_data.name = name
 
                 data_type = pb_data.WhichOneof("data")
@@ -163,3 +110,16 @@ class CollectionServicer(collection_pb2_grpc.CollectionServicer):
                         pb_data.text.language = match.group(2)
 
         return response
+
+
+class AsyncCollectionServicer(CollectionServicer):
+    """Collection servicer for the grpc.aio server.
+
+    Reading and decoding a point is blocking and runs in a thread, all other
+    requests are handled by the migration thread pool of the server.
+    """
+
+    async def get(
+        self, request: collection_pb2.GetRequest, context: grpc.aio.ServicerContext
+    ) -> collection_pb2.GetResponse:
+        return await asyncio.to_thread(super().get, request, context)
@@ -1,4 +1,5 @@
 import grpc
+import asyncio
 import uuid
 import copy
 from concurrent import futures
@@ -9,6 +10,8 @@ import traceback
 from interface import searcher_pb2, searcher_pb2_grpc
 from google.protobuf.json_format import MessageToJson, MessageToDict, ParseDict
 from analyser.jobs.search import SearchJob
+from analyser.jobs.hydration import ResultHydrator
+from analyser.jobs.registry import JobRegistry
 
 
 class SearcherServicer(searcher_pb2_grpc.SearcherServicer):
@@ -17,7 +20,13 @@ class SearcherServicer(searcher_pb2_grpc.SearcherServicer):
         self.shared_object = shared_object
 
         self.search_pool = futures.ThreadPoolExecutor()
-        self.futures = []
+        self.hydrator = shared_object.hydrator
+        if self.hydrator is None:
+            self.hydrator = ResultHydrator(
+                shared_object.data_manager,
+                config=config.get("search", {}).get("hydration"),
+            )
+        self.jobs = JobRegistry(config.get("jobs"))
 
         self.max_results = config.get("indexer", {}).get("max_results", 100)
 
@@ -42,15 +51,17 @@ class SearcherServicer(searcher_pb2_grpc.SearcherServicer):
         return reply
 
     def status(self, request, context):
-        futures_lut = {x["id"]: i for i, x in enumerate(self.futures)}
+        job_data = self.jobs.get(request.id)
 
-        if request.id in futures_lut:
-            job_data = self.futures[futures_lut[request.id]]
+        if job_data is not None:
             done = job_data["future"].done()
 
             if not done:
                 return searcher_pb2.StatusReply(status="running")
 
+            if job_data["future"].cancelled():
+                return searcher_pb2.StatusReply(status="error")
+
             result = job_data["future"].result()
 
             if result is None:
@@ -62,35 +73,44 @@ class SearcherServicer(searcher_pb2_grpc.SearcherServicer):
 
     def search(self, request, context):
         logging.info(f"[Server] Search")
-        job_id = uuid.uuid4().hex
-
-        jsonObj = MessageToDict(request)
-        logging.info(jsonObj)
 
         job_id = uuid.uuid4().hex
-        variable = {
-            "config": self.config,
-            "future": None,
-            "id": job_id,
-            "request": jsonObj,
-        }
-        # search_result = SearchJob(shared_object=self.shared_object)(
-        #     copy.deepcopy(variable)
-        # )
+
+        # the result is kept as proto until it is fetched or evicted
         future = self.search_pool.submit(
-            SearchJob(shared_object=self.shared_object), copy.deepcopy(variable)
+            SearchJob(
+                shared_object=self.shared_object,
+                config=self.config.get("search"),
+                hydrator=self.hydrator,
+            ).search,
+            request,
         )
-        variable["future"] = future
-        self.futures.append(variable)
+        self.jobs.submit(job_id, future)
 
         return searcher_pb2.SearchReply(id=job_id)
 
+    def search_stream(self, request, context):
+        logging.info(f"[SearcherServicer::search_stream]")
+
+        search_job = SearchJob(
+            shared_object=self.shared_object,
+            config=self.config.get("search"),
+            hydrator=self.hydrator,
+        )
+
+        try:
+            yield from search_job.stream(request)
+        except Exception as e:
+            logging.error(f"[SearcherServicer::search_stream] error {repr(e)}")
+            logging.error(traceback.format_exc())
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details("Search error")
+
     def list_search_result(self, request, context):
         logging.info(f"[SearcherServicer::list_search_result] id:{request.id}")
-        futures_lut = {x["id"]: i for i, x in enumerate(self.futures)}
+        job_data = self.jobs.get(request.id)
 
-        if request.id in futures_lut:
-            job_data = self.futures[futures_lut[request.id]]
+        if job_data is not None:
             done = job_data["future"].done()
 
             if not done:
@@ -101,13 +121,23 @@ class SearcherServicer(searcher_pb2_grpc.SearcherServicer):
                 context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
                 context.set_details("Still running")
                 return searcher_pb2.ListSearchResultReply()
+
+            # result() of a cancelled asyncio task raises asyncio.CancelledError,
+            # which is not an Exception
+            if job_data["future"].cancelled():
+                logging.warning(
+                    f"[SearcherServicer::list_search_result] id:{request.id} cancelled"
+                )
+                context.set_code(grpc.StatusCode.CANCELLED)
+                context.set_details("Search cancelled")
+                return searcher_pb2.ListSearchResultReply()
+
             try:
 
                 logging.info(
                     f"[SearcherServicer::list_search_result] id:{request.id} done"
                 )
                 result = job_data["future"].result()
-                result = ParseDict(result, searcher_pb2.ListSearchResultReply())
             except Exception as e:
 
                 logging.error(
@@ -127,3 +157,47 @@ class SearcherServicer(searcher_pb2_grpc.SearcherServicer):
         context.set_details("Job unknown")
 
         return searcher_pb2.ListSearchResultReply()
+
+
+class AsyncSearcherServicer(SearcherServicer):
+    """Searcher for the grpc.aio server, searches run as tasks on the event loop"""
+
+    async def status(self, request, context):
+        return super().status(request, context)
+
+    async def search(self, request, context):
+        logging.info(f"[AsyncSearcherServicer::search]")
+
+        job_id = uuid.uuid4().hex
+
+        task = asyncio.create_task(
+            SearchJob(
+                shared_object=self.shared_object,
+                config=self.config.get("search"),
+                hydrator=self.hydrator,
+            ).search_async(request)
+        )
+        self.jobs.submit(job_id, task)
+
+        return searcher_pb2.SearchReply(id=job_id)
+
+    async def search_stream(self, request, context):
+        logging.info(f"[AsyncSearcherServicer::search_stream]")
+
+        search_job = SearchJob(
+            shared_object=self.shared_object,
+            config=self.config.get("search"),
+            hydrator=self.hydrator,
+        )
+
+        try:
+            async for reply in search_job.stream_async(request):
+                yield reply
+        except Exception as e:
+            logging.error(f"[AsyncSearcherServicer::search_stream] error {repr(e)}")
+            logging.error(traceback.format_exc())
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details("Search error")
+
+    async def list_search_result(self, request, context):
+        return super().list_search_result(request, context)
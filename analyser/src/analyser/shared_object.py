@@ -14,11 +14,14 @@ class SharedObject:
         indexer_plugin_manager,
         data_manager,
         collection_database,
+        hydrator=None,
     ):
         self.inference_server_manager = inference_server_manager
         self.compute_plugin_manager = compute_plugin_manager
         self.indexer_plugin_manager = indexer_plugin_manager
         self.data_manager = data_manager
         self.collection_database = collection_database
+        # shared by the searcher and the collection servicer, which invalidates it
+        self.hydrator = hydrator
 
         self.config = config
@@ -0,0 +1,137 @@
+import sys
+import json
+import time
+import logging
+import argparse
+
+import numpy as np
+import requests
+import imageio.v3 as iio
+
+from interface import analyser_pb2, common_pb2
+from google.protobuf.json_format import MessageToDict, ParseDict
+
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the JSON and protobuf transport to the Ray Serve inference server"
+    )
+
+    parser.add_argument("-v", "--verbose", action="store_true", help="verbose output")
+    parser.add_argument("-d", "--debug", action="store_true", help="verbose output")
+
+    parser.add_argument("--size", default=512, type=int, help="image width and height")
+    parser.add_argument("--batch", default=16, type=int, help="images per request")
+    parser.add_argument("--runs", default=20, type=int, help="number of repetitions")
+    parser.add_argument(
+        "--url",
+        help="url of a deployment (e.g. http://localhost:8000/clip_image_vit-b-32_siglip2-256), "
+        "without it only the encoding and decoding is measured",
+    )
+    parser.add_argument("--plugin", default="", help="plugin name of the request")
+
+    args = parser.parse_args()
+    return args
+
+
+def build_request(plugin, size, batch):
+    rng = np.random.default_rng(42)
+    request = common_pb2.PluginRun(plugin=plugin)
+    for _ in range(batch):
+        image = rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8)
+        input_field = request.inputs.add()
+        input_field.name = "image"
+        input_field.image.content = iio.imwrite("<bytes>", image, extension=".jpg")
+        input_field.image.ext = "jpg"
+
+    return request
+
+
+def run_json(request, session=None, url=None):
+    payload = json.dumps({"inputs": MessageToDict(request)}).encode()
+
+    if url is None:
+        # simulate the deployment side
+        received = ParseDict(json.loads(payload)["inputs"], common_pb2.PluginRun())
+        return len(payload), received
+
+    response = session.post(
+        url, data=payload, headers={"Content-Type": "application/json"}
+    )
+    return len(payload), ParseDict(response.json(), analyser_pb2.AnalyseReply())
+
+
+def run_protobuf(request, session=None, url=None):
+    payload = request.SerializeToString()
+
+    if url is None:
+        # simulate the deployment side
+        received = common_pb2.PluginRun()
+        received.ParseFromString(payload)
+        return len(payload), received
+
+    response = session.post(
+        url,
+        data=payload,
+        headers={
+            "Content-Type": PROTOBUF_CONTENT_TYPE,
+            "Accept": PROTOBUF_CONTENT_TYPE,
+        },
+    )
+    result = analyser_pb2.AnalyseReply()
+    result.ParseFromString(response.content)
+    return len(payload), result
+
+
+def benchmark(name, function, request, runs, session=None, url=None):
+    timings = []
+    payload_size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        payload_size, _ = function(request, session=session, url=url)
+        timings.append(time.perf_counter() - start)
+
+    timings = np.asarray(timings) * 1000
+    print(
+        f"{name:>9}: payload {payload_size / 1024:10.1f} KiB "
+        f"mean {timings.mean():8.2f} ms median {np.median(timings):8.2f} ms "
+        f"min {timings.min():8.2f} ms"
+    )
+
+
+def main():
+    args = parse_args()
+    level = logging.ERROR
+    if args.debug:
+        level = logging.DEBUG
+    elif args.verbose:
+        level = logging.INFO
+
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s: %(message)s",
+        datefmt="%d-%m-%Y %H:%M:%S",
+        level=level,
+    )
+
+    request = build_request(args.plugin, args.size, args.batch)
+    raw_size = sum(len(x.image.content) for x in request.inputs)
+    print(
+        f"{args.batch} JPEG images {args.size}x{args.size}, "
+        f"{raw_size / 1024:.1f} KiB encoded image data"
+    )
+
+    session = None
+    if args.url is not None:
+        session = requests.Session()
+
+    benchmark("json", run_json, request, args.runs, session=session, url=args.url)
+    benchmark(
+        "protobuf", run_protobuf, request, args.runs, session=session, url=args.url
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
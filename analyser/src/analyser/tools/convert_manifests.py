@@ -0,0 +1,81 @@
+import argparse
+import functools
+import logging
+import os
+import sys
+from concurrent import futures
+
+from tqdm import tqdm
+
+from data import DataManager, manifest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Convert the YAML manifests of all data packets in a data directory"
+    )
+
+    parser.add_argument("-v", "--verbose", action="store_true", help="verbose output")
+    parser.add_argument("-d", "--debug", action="store_true", help="verbose output")
+
+    parser.add_argument("-i", "--data-path", required=True, help="data directory")
+    parser.add_argument(
+        "-s",
+        "--store",
+        choices=["files", "segments"],
+        default="files",
+        help="store type of the data directory ([data.store] type), segment stores "
+        "must not be used by a running server",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=8)
+
+    args = parser.parse_args()
+    return args
+
+
+def list_packets(data_path):
+    for root, _, files in os.walk(data_path):
+        for file in files:
+            if file.endswith(".zip"):
+                yield os.path.join(root, file)
+
+
+def main():
+    args = parse_args()
+
+    level = logging.ERROR
+    if args.debug:
+        level = logging.DEBUG
+    elif args.verbose:
+        level = logging.INFO
+
+    logging.basicConfig(format="%(asctime)s %(levelname)s: %(message)s", level=level)
+
+    if args.store == "segments":
+        # packets are read from and appended to the segments of the store
+        data_manager = DataManager(data_dir=args.data_path, store={"type": "segments"})
+        paths = data_manager.store.ids()
+        convert = functools.partial(manifest.convert_packet, data_manager)
+    else:
+        paths = list(list_packets(args.data_path))
+        convert = manifest.convert
+
+    num_converted = 0
+    num_failed = 0
+    with futures.ThreadPoolExecutor(max_workers=args.workers) as pool:
+        jobs = {pool.submit(convert, path): path for path in paths}
+        for job in tqdm(futures.as_completed(jobs), total=len(jobs)):
+            try:
+                if job.result():
+                    num_converted += 1
+            except Exception as e:
+                num_failed += 1
+                logging.error(f"[convert_manifests] {jobs[job]}: {repr(e)}")
+
+    print(f"{num_converted} of {len(paths)} packets converted, {num_failed} failed")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
 from .cache import CacheManager, Cache, get_hash_for_plugin
 from .cache_plugins.redis_database import *
+from .cache_plugins.mmap_database import *
 
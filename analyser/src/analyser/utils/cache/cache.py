@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import Dict
+from typing import Any, Dict
 
 from analyser.utils.plugin import Plugin
 from analyser.utils.plugin import Factory
@@ -9,6 +10,13 @@ class Cache(Plugin):
     def __init__(self, config=None):
         super().__init__(config)
 
+    # caches without an async client block a worker thread of the event loop
+    async def get_async(self, id: str) -> Any:
+        return await asyncio.to_thread(self.get, id)
+
+    async def set_async(self, id: str, data: Any) -> bool:
+        return await asyncio.to_thread(self.set, id, data)
+
 
 class CacheManager(Factory):
     _plugins = {}
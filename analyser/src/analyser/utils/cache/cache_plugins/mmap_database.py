@@ -0,0 +1,127 @@
+from typing import Any, List, Iterator
+import os
+import mmap
+import struct
+import logging
+import threading
+
+import msgpack
+
+from analyser.utils.cache import CacheManager, Cache
+
+default_config = {"path": "/tmp/cache/mmap"}
+
+# every record in the data file is stored as [key length][value length][key][value]
+RECORD_HEADER = struct.Struct("<II")
+# a value length marking a deleted key
+TOMBSTONE = 0xFFFFFFFF
+
+
+@CacheManager.export("mmap")
+class MmapCache(Cache, config=default_config, version="0.1"):
+    def __init__(self, config=None):
+        super().__init__(config)
+        os.makedirs(self.config.get("path"), exist_ok=True)
+
+        self.data_path = os.path.join(self.config.get("path"), "data.bin")
+        self.mutex = threading.Lock()
+        self.index = {}
+        self.mmap = None
+
+        self.data_file = open(self.data_path, "a+b")
+        self.read_index()
+
+    def read_index(self) -> None:
+        # only the record headers are read, values stay on disk until they are needed
+        size = os.path.getsize(self.data_path)
+        offset = 0
+        with open(self.data_path, "rb") as f:
+            while offset + RECORD_HEADER.size <= size:
+                f.seek(offset)
+                key_length, value_length = RECORD_HEADER.unpack(
+                    f.read(RECORD_HEADER.size)
+                )
+                value_offset = offset + RECORD_HEADER.size + key_length
+                if value_length == TOMBSTONE:
+                    if value_offset > size:
+                        break
+                    self.index.pop(f.read(key_length).decode("utf-8"), None)
+                    offset = value_offset
+                    continue
+                if value_offset + value_length > size:
+                    break
+                key = f.read(key_length).decode("utf-8")
+                self.index[key] = (value_offset, value_length)
+                offset = value_offset + value_length
+
+        if offset < size:
+            logging.warning(
+                f"MmapCache: drop incomplete record at the end of {self.data_path}"
+            )
+            self.data_file.truncate(offset)
+
+    def get_mmap(self, end: int) -> mmap.mmap:
+        if self.mmap is None or len(self.mmap) < end:
+            if self.mmap is not None:
+                self.mmap.close()
+            self.mmap = mmap.mmap(self.data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.mmap
+
+    def set(self, id: str, data: Any) -> bool:
+        try:
+            packed = msgpack.packb(data)
+            key = id.encode("utf-8")
+            with self.mutex:
+                if id in self.index:
+                    return True
+                self.data_file.seek(0, os.SEEK_END)
+                offset = self.data_file.tell()
+                self.data_file.write(
+                    RECORD_HEADER.pack(len(key), len(packed)) + key + packed
+                )
+                self.data_file.flush()
+                self.index[id] = (
+                    offset + RECORD_HEADER.size + len(key),
+                    len(packed),
+                )
+            return True
+        except Exception as e:
+            logging.error(f"MmapCache {e}")
+            return False
+
+    def delete(self, id: str) -> bool:
+        # the value stays in the data file, a tombstone hides it after a restart
+        try:
+            key = id.encode("utf-8")
+            with self.mutex:
+                if self.index.pop(id, None) is None:
+                    return False
+                self.data_file.seek(0, os.SEEK_END)
+                self.data_file.write(RECORD_HEADER.pack(len(key), TOMBSTONE) + key)
+                self.data_file.flush()
+            return True
+        except Exception as e:
+            logging.error(f"MmapCache {e}")
+            return None
+
+    def get(self, id: str) -> Any:
+        try:
+            with self.mutex:
+                if id not in self.index:
+                    return None
+                offset, length = self.index[id]
+                packed = self.get_mmap(offset + length)[offset : offset + length]
+            return msgpack.unpackb(packed)
+        except Exception as e:
+            logging.error(f"MmapCache {e}")
+            return None
+
+    def keys(self) -> List[str]:
+        with self.mutex:
+            return list(self.index.keys())
+
+    def __iter__(self) -> Iterator:
+        for key in self.keys():
+            value = self.get(key)
+            if value is not None:
+                yield key, value
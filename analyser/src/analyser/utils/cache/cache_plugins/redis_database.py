@@ -2,6 +2,7 @@ from typing import Any, List, Iterator
 import logging
 
 import valkey
+import valkey.asyncio
 import msgpack
 
 from analyser.utils.cache import CacheManager, Cache
@@ -30,6 +31,17 @@ class valkeyCache(Cache, config=default_config, version="0.1"):
             port=self.config.get("port"),
             db=self.config.get("db"),
         )
+        # created on first use inside the event loop of the aio server
+        self.async_r = None
+
+    def get_async_client(self) -> valkey.asyncio.Valkey:
+        if self.async_r is None:
+            self.async_r = valkey.asyncio.Valkey(
+                host=self.config.get("host"),
+                port=self.config.get("port"),
+                db=self.config.get("db"),
+            )
+        return self.async_r
 
     def set(self, id: str, data: Any) -> bool:
         try:
@@ -58,6 +70,25 @@ class valkeyCache(Cache, config=default_config, version="0.1"):
             logging.error(f"valkeyCache {e}")
             return None
 
+    async def set_async(self, id: str, data: Any) -> bool:
+        try:
+            packed = msgpack.packb(data)
+            tag = self.config.get("tag")
+            await self.get_async_client().set(f"{tag}:{id}", packed)
+        except Exception as e:
+            logging.error(f"valkeyCache {e}")
+
+    async def get_async(self, id: str) -> Any:
+        try:
+            tag = self.config.get("tag")
+            packed = await self.get_async_client().get(f"{tag}:{id}")
+            if packed is None:
+                return None
+            return msgpack.unpackb(packed)
+        except Exception as e:
+            logging.error(f"valkeyCache {e}")
+            return None
+
     def keys(self) -> List[str]:
         try:
             tag = self.config.get("tag")
@@ -20,9 +20,8 @@ class Plugin:
         cls._name = convert_name(cls.__name__)
 
     def __init__(self, config=None):
-        self._config = self._default_config
-        if self._config is None:
-            self._config = dict()
+        # copy the defaults, several instances of one plugin can have different configs
+        self._config = dict(self._default_config or {})
         if config is not None:
             self._config.update(config)
 
@@ -284,6 +284,24 @@ class Search(RPCView):
 
         return grpc_request
 
+    def check_collections(self, grpc_request, user=None):
+        for collection_id in grpc_request.collections:
+            try:
+                collection_db = Collection.objects.get(hash_id=collection_id)
+            except Collection.DoesNotExist:
+                logger.error(f"Search::check_collections collection is not known")
+                return False
+
+            if user is None and collection_db.visibility != "V":
+                logger.error(f"Search::check_collections collection is not visible")
+                return False
+
+            if user and collection_db.user != user and collection_db.visibility == "U":
+                logger.error(f"Search::check_collections collection is from another user")
+                return False
+
+        return True
+
     def rpc_load(self, params, ids=None, collection_ids=None, user=None):
         grpc_request = self.parse_search_request(
             params,
@@ -294,20 +312,8 @@ class Search(RPCView):
             f"Search::rpc_load parse_search_request:'{MessageToJson(grpc_request)}'"
         )
 
-        for collection_id in grpc_request.collections:
-            try:
-                collection_db = Collection.objects.get(hash_id=collection_id)
-            except Collection.DoesNotExist:
-                logger.error(f"Search::rpc_load collection is not known")
-                return None
-
-            if user is None and collection_db.visibility != "V":
-                logger.error(f"Search::rpc_load collection is not visible")
-                return None
-
-            if user and collection_db.user != user and collection_db.visibility == "U":
-                logger.error(f"Search::rpc_load collection is from another user")
-                return None
+        if not self.check_collections(grpc_request, user):
+            return None
 
         grpc_request_bin = grpc_request.SerializeToString()
         grpc_request_hash = hashlib.sha256(grpc_request_bin).hexdigest()
@@ -327,154 +333,162 @@ class Search(RPCView):
             pass
         return {"job_id": response.id}
 
-    def rpc_check_load(self, job_id, collections=None):
-        stub = searcher_pb2_grpc.SearcherStub(self.channel)
-        request = searcher_pb2.ListSearchResultRequest(id=job_id)
+    def parse_search_result(self, entries_proto, aggregate_proto=None):
+        if aggregate_proto is None:
+            aggregate_proto = []
 
-        try:
-            response = stub.list_search_result(request)
+        entries = []
 
-            entries = []
+        for e in entries_proto:
+            entry = {
+                "id": e.id,
+                "meta": [],
+                "images": [],
+            }
 
-            for e in response.entries:
-                entry = {
-                    "id": e.id,
-                    "meta": [],
-                    "images": [],
-                }
+            geo_data = {}
 
-                geo_data = {}
+            for data in e.data:
+                data_type = data.WhichOneof("data")
 
-                for data in e.data:
-                    data_type = data.WhichOneof("data")
+                if data_type == "bool":
+                    entry["meta"].append({
+                        "name": data.name,
+                        "value": data.bool.value,
+                        "type": data_type,
+                    })
+                elif data_type == "int":
+                    entry["meta"].append({
+                        "name": data.name,
+                        "value": data.int.value,
+                        "type": data_type,
+                    })
+                elif data_type == "float":
+                    entry["meta"].append({
+                        "name": data.name,
+                        "value": data.float.value,
+                        "type": data_type,
+                    })
+                elif data_type == "text":
+                    data_value = data.text.text
 
-                    if data_type == "bool":
+                    if not data_value.startswith("http://"):
                         entry["meta"].append({
                             "name": data.name,
-                            "value": data.bool.value,
+                            "value": data_value,
                             "type": data_type,
+                            "language": data.text.language,
                         })
-                    elif data_type == "int":
-                        entry["meta"].append({
-                            "name": data.name,
-                            "value": data.int.value,
-                            "type": data_type,
-                        })
-                    elif data_type == "float":
-                        entry["meta"].append({
-                            "name": data.name,
-                            "value": data.float.value,
-                            "type": data_type,
-                        })
-                    elif data_type == "text":
-                        data_value = data.text.text
-
-                        if not data_value.startswith("http://"):
-                            entry["meta"].append({
-                                "name": data.name,
-                                "value": data_value,
-                                "type": data_type,
-                                "language": data.text.language,
-                            })
-                    elif data_type == "geo":
-                        data_name = '/'.join(data.name.split('/')[:2])
-                        geo_data[data_name] = {
-                            "lat": data.geo.lat,
-                            "lon": data.geo.lon,
+                elif data_type == "geo":
+                    data_name = '/'.join(data.name.split('/')[:2])
+                    geo_data[data_name] = {
+                        "lat": data.geo.lat,
+                        "lon": data.geo.lon,
+                    }
+                elif data_type == "image":
+                    base_url = "http://localhost:8000"
+
+                    entry["images"].append(
+                        {
+                            "path": f"{base_url}{media_url_to_image(data.id)}",
+                            "preview": f"{base_url}{media_url_to_preview(data.id)}",
                         }
-                    elif data_type == "image":
-                        base_url = "http://localhost:8000"
-
-                        entry["images"].append(
-                            {
-                                "path": f"{base_url}{media_url_to_image(data.id)}",
-                                "preview": f"{base_url}{media_url_to_preview(data.id)}",
-                            }
-                        )
-
-                if geo_data:
-                    for row in entry["meta"]:
-                        if row["name"] in geo_data:
-                            row["lat"] = geo_data[row["name"]]["lat"]
-                            row["lon"] = geo_data[row["name"]]["lon"]
-
-                entries.append(entry)
-
-            def sort_key(field):
-                if field == "meta/time/start":
-                    return (0, field)
-                elif field == "meta/creator":
-                    return (1, field)
-                else:
-                    return (2, field)
-
-            aggregations = []
-
-            for e in response.aggregate:
-                aggr = {
-                    "field": e.field_name,
-                    "entries": [],
-                }
+                    )
 
-                for x in sorted(e.entries, key=lambda x: sort_key(x.key)):
-                    aggr["entries"].append({
-                        "name": x.key,
-                        "count": x.int_val,
-                    })
+            if geo_data:
+                for row in entry["meta"]:
+                    if row["name"] in geo_data:
+                        row["lat"] = geo_data[row["name"]]["lat"]
+                        row["lon"] = geo_data[row["name"]]["lon"]
 
-                aggregations.append(aggr)
+            entries.append(entry)
 
-            if not aggregations:
-                from statistics import fmean
-                from collections import defaultdict, Counter
+        def sort_key(field):
+            if field == "meta/time/start":
+                return (0, field)
+            elif field == "meta/creator":
+                return (1, field)
+            else:
+                return (2, field)
 
-                field_counters = defaultdict(Counter)
-                coords = defaultdict(lambda: {"lat": [], "lon": []}) 
+        aggregations = []
 
-                for entry in entries:
-                    for m in entry.get("meta", []):
-                        name = m.get("name")
-                        value = m.get("value")
+        for e in aggregate_proto:
+            aggr = {
+                "field": e.field_name,
+                "entries": [],
+            }
 
-                        if not name or value is None:
-                            continue
+            for x in sorted(e.entries, key=lambda x: sort_key(x.key)):
+                aggr["entries"].append({
+                    "name": x.key,
+                    "count": x.int_val,
+                })
 
-                        field_counters[name][value] += 1
+            aggregations.append(aggr)
 
-                        lat = m.get("lat")
-                        lon = m.get("lon")
-                        if lat and lon:
-                            coords[value]["lat"].append(lat)
-                            coords[value]["lon"].append(lon)
+        if not aggregations:
+            from statistics import fmean
+            from collections import defaultdict, Counter
 
-                for field, counter in sorted(
-                    field_counters.items(),
-                    key=lambda x: sort_key(x[0])
-                ):
-                    entries_out = []
+            field_counters = defaultdict(Counter)
+            coords = defaultdict(lambda: {"lat": [], "lon": []}) 
 
-                    for name, count in counter.most_common(50):
-                        item = {
-                            "name": name,
-                            "count": count,
-                        }
+            for entry in entries:
+                for m in entry.get("meta", []):
+                    name = m.get("name")
+                    value = m.get("value")
 
-                        c = coords.get(name)
-                        if c and c["lat"] and c["lon"]:
-                            item["lat"] = fmean(c["lat"])
-                            item["lon"] = fmean(c["lon"])
+                    if not name or value is None:
+                        continue
 
-                        entries_out.append(item)
+                    field_counters[name][value] += 1
 
-                    aggregations.append({
-                        "field": field,
-                        "entries": entries_out,
-                    })
+                    lat = m.get("lat")
+                    lon = m.get("lon")
+                    if lat and lon:
+                        coords[value]["lat"].append(lat)
+                        coords[value]["lon"].append(lon)
 
-            result = {
-                "entries": entries,
-                "aggregations": aggregations,
-            }
+            for field, counter in sorted(
+                field_counters.items(),
+                key=lambda x: sort_key(x[0])
+            ):
+                entries_out = []
+
+                for name, count in counter.most_common(50):
+                    item = {
+                        "name": name,
+                        "count": count,
+                    }
+
+                    c = coords.get(name)
+                    if c and c["lat"] and c["lon"]:
+                        item["lat"] = fmean(c["lat"])
+                        item["lon"] = fmean(c["lon"])
+
+                    entries_out.append(item)
+
+                aggregations.append({
+                    "field": field,
+                    "entries": entries_out,
+                })
+
+        return {
+            "entries": entries,
+            "aggregations": aggregations,
+        }
+
+    def rpc_check_load(self, job_id, collections=None):
+        stub = searcher_pb2_grpc.SearcherStub(self.channel)
+        request = searcher_pb2.ListSearchResultRequest(id=job_id)
+
+        try:
+            response = stub.list_search_result(request)
+
+            result = self.parse_search_result(
+                response.entries, response.aggregate
+            )
 
             request_hash = cache.get(job_id)
 
@@ -551,6 +565,8 @@ class Search(RPCView):
         if collections:
             collection_ids = [c["hash_id"] for c in collections]
 
+        # the unary search keeps the request hash cache, the result is fetched with
+        # the job id
         result = self.rpc_load(params, image_ids, collection_ids, request.user)
 
         if result is None:
@@ -1,11 +1,11 @@
 import zipfile
 import logging
-import yaml
 from dataclasses import dataclass, field, fields, asdict
 from typing import Callable, Optional, Dict
 
 import uuid
 
+from . import manifest
 from .fs_handler import FSHandler
 
 
@@ -44,9 +44,7 @@ class Data:
     def load_dict(self, filename: str) -> Dict:
         assert self.check_fs(), "No filesystem handler installed"
 
-        with self.fs.open_file(filename, "r") as f:
-            decoded_data = f.read().decode("utf-8")
-            return yaml.safe_load(decoded_data)
+        return self.fs.read_dict(filename)
 
     def save(self) -> None:
 
@@ -59,9 +57,9 @@ class Data:
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        with self.fs.open_file(filename, "w") as f:
-
-            f.write(yaml.safe_dump(data).encode())
+        # stored with the manifest encoding, e.g. meta.yml is written as meta.json
+        with self.fs.open_file(manifest.manifest_name(filename), "w") as f:
+            f.write(manifest.encode(data))
 
     def to_dict(self) -> dict:
         data_dict = {}
@@ -1,15 +1,52 @@
 import zipfile
 import logging
+import mmap
+import struct
+import time
 import yaml
 import os
 from dataclasses import dataclass, field, fields, asdict
-from typing import Callable, Optional, Dict
+from typing import Callable, Optional, Dict, Tuple
 
 import uuid
 
+from . import manifest
+from .segment_store import SegmentStore
+
+# members that are compressed, media and arrays are already compact and are stored
+# as they are, so they can be mapped directly from the packet
+DEFLATED_EXTENSIONS = {".json", ".yml", ".yaml", ".txt"}
+
+
+def compress_type(filename: str) -> int:
+    if os.path.splitext(filename)[1].lower() in DEFLATED_EXTENSIONS:
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
 
 class FSHandler:
-    pass
+    def read_dict(self, filename: str) -> Dict:
+        # packets are immutable once written, so manifests are parsed only once
+        if self.mode != "r":
+            return manifest.read(lambda x: self.open_file(x, "r"), filename)
+
+        if filename not in self.dicts:
+            self.dicts[filename] = manifest.read(
+                lambda x: self.open_file(x, "r"), filename
+            )
+        return self.dicts[filename]
+
+    def map_file(self, filename: str) -> memoryview | None:
+        """Read only view of an uncompressed file, None if it has to be read"""
+        return None
+
+    def read_file(self, filename: str) -> bytes:
+        view = self.map_file(filename)
+        if view is not None:
+            return bytes(view)
+
+        with self.open_file(filename, "r") as f:
+            return f.read()
 
 
 class ZipFSHandler(FSHandler):
@@ -27,13 +64,33 @@ class ZipFSHandler(FSHandler):
         self.path = path
         self.zipfile = None
         self.mode = mode
+        # parsed manifests, e.g. the meta.yml that is read to find the data type
+        self.dicts = {}
+        # mapping of the archive, created by the first map_file
+        self.mmap = None
+        self.mmap_offset = 0
 
     def open(self, data) -> None:
         logging.debug(f"open {self.path}")
-        self.zipfile = zipfile.ZipFile(self.path, self.mode)
+        # the archive might already be opened by read_dict
+        if self.zipfile is None:
+            self.zipfile = self.open_archive()
         if self.mode == "r":
             data.load()
 
+    def open_archive(self) -> zipfile.ZipFile:
+        return zipfile.ZipFile(self.path, self.mode)
+
+    def map_archive(self) -> Tuple[mmap.mmap, int]:
+        """Mapping of the file that contains the archive and the offset of the archive"""
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), 0
+
+    def read_dict(self, filename: str) -> Dict:
+        if self.zipfile is None:
+            self.zipfile = self.open_archive()
+        return super().read_dict(filename)
+
     def list_files(self) -> None:
         if self.zipfile is None:
             raise Exception()
@@ -53,6 +110,8 @@ class ZipFSHandler(FSHandler):
         if self.mode == "r":
             self.zipfile.close()
             self.zipfile = None
+            # arrays might still reference the mapping, it is closed with the last one
+            self.mmap = None
             return
 
         data.save()
@@ -78,13 +137,76 @@ class ZipFSHandler(FSHandler):
         if mode == "w" and self.mode == "r":
             raise ValueError
 
+        if mode == "w":
+            info = zipfile.ZipInfo(filename, date_time=time.localtime(time.time())[:6])
+            info.compress_type = compress_type(filename)
+            return self.zipfile.open(info, mode=mode, force_zip64=True)
+
         return self.zipfile.open(filename, mode=mode, force_zip64=True)
 
+    def map_file(self, filename: str) -> memoryview | None:
+        if self.zipfile is None or self.mode != "r":
+            return None
+
+        info = self.zipfile.getinfo(filename)
+        # compressed or encrypted members can't be mapped
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return None
+
+        if self.mmap is None:
+            self.mmap, self.mmap_offset = self.map_archive()
+
+        # the data follows the local file header and its variable length fields
+        header_offset = self.mmap_offset + info.header_offset
+        name_length, extra_length = struct.unpack(
+            "<HH", self.mmap[header_offset + 26 : header_offset + 30]
+        )
+        start = header_offset + 30 + name_length + extra_length
+
+        return memoryview(self.mmap)[start : start + info.file_size]
+
+
+class SegmentFSHandler(ZipFSHandler):
+    """Packet stored in a SegmentStore instead of its own zip file"""
+
+    def __init__(self, store: SegmentStore, data_id: str, mode: str = "r") -> None:
+        super().__init__(f"{store.path}:{data_id}", mode=mode)
+        self.store = store
+        self.data_id = data_id
+        self.file = None
+
+    def open_archive(self) -> zipfile.ZipFile:
+        if self.mode == "r":
+            self.file = self.store.open(self.data_id)
+            if self.file is None:
+                raise KeyError(f"Data not found with data_id {self.data_id}")
+        else:
+            self.file = self.store.writer(self.data_id)
+
+        return zipfile.ZipFile(self.file, self.mode)
+
+    def map_archive(self) -> Tuple[mmap.mmap, int]:
+        # the segment is mapped through the open file, it might be removed by a
+        # compaction in the meantime
+        return (
+            mmap.mmap(self.file.file.fileno(), 0, access=mmap.ACCESS_READ),
+            self.file.offset,
+        )
+
+    def close(self, data) -> None:
+        super().close(data)
+
+        # the packet is appended to the store when its writer is closed
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
 
 class LocalFSHandler(FSHandler):
     def __init__(self, fs: FSHandler, path: str) -> None:
         self.fs = fs
         self.path = path
+        self.dicts = {}
 
     def open(self, data) -> None:
         logging.debug(f"open {self.path}")
@@ -130,3 +252,9 @@ class LocalFSHandler(FSHandler):
             raise ValueError
 
         return self.fs.open_file(os.path.join(self.path, filename), mode=mode)
+
+    def map_file(self, filename: str) -> memoryview | None:
+        if self.fs is None:
+            return None
+
+        return self.fs.map_file(os.path.join(self.path, filename))
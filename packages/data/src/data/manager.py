@@ -6,14 +6,16 @@ import logging
 import json
 import tempfile
 import hashlib
-from typing import Any, Iterator, List
+import weakref
+from typing import IO, Any, Dict, Iterator, List
 from collections.abc import Iterable
 
 from dataclasses import field
 
 from .data import Data
-from .fs_handler import ZipFSHandler
-from .utils import create_data_path, generate_id
+from .fs_handler import FSHandler, SegmentFSHandler, ZipFSHandler
+from .segment_store import SegmentStore
+from .utils import create_data_path, data_path, generate_id
 from analyser.utils.cache import Cache
 
 
@@ -22,12 +24,19 @@ class DataManager:
     _data_enum_lut = {}
     _data_minetype_lut = {}
 
-    def __init__(self, data_dir=None, cache: Cache = None):
+    def __init__(self, data_dir=None, cache: Cache = None, store: Dict = None):
         self.cache = cache
         if not data_dir:
             data_dir = tempfile.mkdtemp()
         self.data_dir = data_dir
 
+        # packets are either stored in their own zip file or appended to segments
+        self.store = None
+        if store is not None and store.get("type", "files") == "segments":
+            self.store = SegmentStore(
+                os.path.join(self.data_dir, "segments"), config=store.get("params")
+            )
+
     @classmethod
     def export(cls, name: str, enum_value: int, minetype: List[str] = None):
         def export_helper(data):
@@ -47,10 +56,38 @@ class DataManager:
             data = self._data_name_lut[data_type](id=data_id)
         else:
             data = self._data_name_lut[data_type]()
-        data_path = create_data_path(self.data_dir, data.id, "zip")
-        data._register_fs_handler(ZipFSHandler(data_path, mode="w"))
+        data._register_fs_handler(self._fs_handler(data.id, mode="w"))
         return data
 
+    def _fs_handler(self, data_id: str, mode: str = "r") -> FSHandler:
+        if self.store is not None:
+            return SegmentFSHandler(self.store, data_id, mode=mode)
+
+        if mode == "w":
+            return ZipFSHandler(create_data_path(self.data_dir, data_id, "zip"), mode)
+        return ZipFSHandler(data_path(self.data_dir, data_id, "zip"), mode)
+
+    def exists(self, data_id: str) -> bool:
+        if self.store is not None:
+            return data_id in self.store
+        return os.path.exists(data_path(self.data_dir, data_id, "zip"))
+
+    def open_packet(self, data_id: str, mode: str = "r") -> IO[bytes] | None:
+        """Raw zip file of a packet"""
+        if self.store is not None:
+            if mode == "w":
+                return self.store.writer(data_id)
+            return self.store.open(data_id)
+
+        if mode == "w":
+            return open(create_data_path(self.data_dir, data_id, "zip"), "wb")
+        return open(data_path(self.data_dir, data_id, "zip"), "rb")
+
+    def compact(self) -> int:
+        if self.store is None:
+            return 0
+        return self.store.compact()
+
     def _create_data_path(self, data_id) -> str:
         return self._create_file_path(data_id, "zip")
 
@@ -58,31 +95,37 @@ class DataManager:
         return create_data_path(self.data_dir, data_id, extension)
 
     def load(self, data_id: str) -> Data | None:
-        data_path = create_data_path(self.data_dir, data_id, "zip")
-
-        if not os.path.exists(data_path):
+        if not self.exists(data_id):
             logging.error(f"Data not found with data_id {data_id}")
             return None
 
-        data = Data()
-        data._register_fs_handler(ZipFSHandler(data_path, mode="r"))
-        data_type = None
-
-        with data:
-            data_type = data.type
-            data_id = data.id
-
-        assert data_type in self._data_name_lut, f"Unknown data type {data_type}"
-
-        data = self._data_name_lut[data_type](id=data_id)
-        data._register_fs_handler(ZipFSHandler(data_path, mode="r"))
+        # the handler keeps the archive and the parsed meta.yml for the typed data,
+        # so it is opened and parsed only once
+        fs = self._fs_handler(data_id, mode="r")
+        try:
+            meta = fs.read_dict("meta.yml")
+            data_type = meta.get("type")
+            assert data_type in self._data_name_lut, f"Unknown data type {data_type}"
+        except Exception:
+            fs.close(None)
+            raise
+
+        data = self._data_name_lut[data_type](id=meta.get("id", data_id))
+        data._register_fs_handler(fs)
+        # `with data:` closes the archive, packets that are never entered close it
+        # when they are collected
+        weakref.finalize(data, fs.close, None)
 
         return data
 
     def delete(self, data_id: str):
-        data_path = create_data_path(self.data_dir, data_id, "zip")
-        if os.path.exists(data_path):
-            os.remove(data_path)
+        if self.store is not None:
+            self.store.delete(data_id)
+            return
+
+        path = data_path(self.data_dir, data_id, "zip")
+        if os.path.exists(path):
+            os.remove(path)
 
     def load_file_from_stream(self, data_stream: Iterable) -> tuple(Data, str):
         data_stream = iter(data_stream)
@@ -98,7 +141,7 @@ class DataManager:
 
         if first_pkg.id is not None and len(first_pkg.id) > 0:
             data_id = first_pkg.id
-            if os.path.exists(create_data_path(self.data_dir, data_id, "zip")):
+            if self.exists(data_id):
                 logging.error(f"Data with id already exists {data_id}")
                 return None
             data = self._data_enum_lut[data_type](id=data_id)
@@ -110,8 +153,7 @@ class DataManager:
             f"Data {data.type} has no function load_file_from_stream"
         )
 
-        data_path = create_data_path(self.data_dir, data.id, "zip")
-        data._register_fs_handler(ZipFSHandler(data_path, mode="w"))
+        data._register_fs_handler(self._fs_handler(data.id, mode="w"))
 
         def data_generator():
             yield first_pkg
@@ -152,8 +194,6 @@ class DataManager:
 
         hash_stream = hashlib.sha1()
 
-        output_path = create_data_path(self.data_dir, data_id, "zip")
-
         def data_generator():
             yield first_pkg.data_encoded
 
@@ -162,27 +202,25 @@ class DataManager:
                 hash_stream.update(x.data_encoded)
                 yield x.data_encoded
 
-        if os.path.exists(output_path):
+        if self.exists(data_id):
             logging.warning(f"Data with id already exists {data_id}")
             # We trust analyser data
             for x in data_generator():
                 pass
             return self.load(data_id), hash_stream.hexdigest()
 
-        with open(output_path, "wb") as f_out:
+        with self.open_packet(data_id, mode="w") as f_out:
             for x in data_generator():
                 f_out.write(x)
 
         return self.load(data_id), hash_stream.hexdigest()
 
     def dump_to_stream(self, data_id: str, chunk_size: int = 131_072) -> Iterator[dict]:
-        data_path = create_data_path(self.data_dir, data_id, "zip")
-
-        if not os.path.exists(data_path):
+        if not self.exists(data_id):
             logging.error(f"Data not found with id {data_id}")
             return None
 
-        with open(data_path, "rb") as bytestream:
+        with self.open_packet(data_id) as bytestream:
             while True:
                 chunk = bytestream.read(chunk_size)
                 if not chunk:
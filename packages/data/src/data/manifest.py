@@ -0,0 +1,114 @@
+import contextlib
+import io
+import json
+import os
+import zipfile
+from typing import IO, Callable, Dict
+
+import yaml
+
+# version of the encoding of the manifest files (meta.yml, list_data.yml, ...)
+MANIFEST_VERSION = 1
+MANIFEST_EXT = ".json"
+LEGACY_EXT = ".yml"
+
+
+def manifest_name(filename: str) -> str:
+    """Name of the file in the packet for a manifest name like `meta.yml`"""
+    return os.path.splitext(filename)[0] + MANIFEST_EXT
+
+
+def encode(data: Dict) -> bytes:
+    return json.dumps(
+        {"version": MANIFEST_VERSION, "data": data}, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def decode(raw: bytes) -> Dict:
+    manifest = json.loads(raw)
+    version = manifest.get("version")
+    if version is None or version > MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version {version}")
+    return manifest.get("data")
+
+
+def decode_legacy(raw: bytes) -> Dict:
+    return yaml.safe_load(raw.decode("utf-8"))
+
+
+def read(open_file: Callable[[str], IO[bytes]], filename: str) -> Dict:
+    """Reads a manifest, packets written by older versions contain YAML files"""
+    try:
+        with open_file(manifest_name(filename)) as f:
+            return decode(f.read())
+    except KeyError:
+        pass
+
+    with open_file(filename) as f:
+        return decode_legacy(f.read())
+
+
+def has_legacy(z_in: zipfile.ZipFile) -> bool:
+    return any(x.endswith(LEGACY_EXT) for x in z_in.namelist())
+
+
+def rewrite(z_in: zipfile.ZipFile, f_out: IO[bytes]) -> None:
+    """Copies a packet to f_out with its YAML manifests converted"""
+    infos = z_in.infolist()
+    names = {x.filename for x in infos}
+    with zipfile.ZipFile(f_out, "w") as z_out:
+        for info in infos:
+            raw = z_in.read(info)
+            if not info.filename.endswith(LEGACY_EXT):
+                z_out.writestr(info, raw)
+                continue
+
+            name = manifest_name(info.filename)
+            if name in names:
+                continue
+            z_out.writestr(
+                zipfile.ZipInfo(name, date_time=info.date_time),
+                encode(decode_legacy(raw)),
+                # manifests are always deflated, see fs_handler.compress_type
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+
+
+def convert(path: str) -> bool:
+    """Rewrites the YAML manifests of a packet, returns False if there are none"""
+    with zipfile.ZipFile(path, "r") as z_in:
+        if not has_legacy(z_in):
+            return False
+
+        # the new packet replaces the old one only when it is complete
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f_out:
+                rewrite(z_in, f_out)
+        except Exception:
+            # the temporary file might not exist, its error must not hide this one
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
+    os.replace(tmp_path, path)
+    return True
+
+
+def convert_packet(data_manager: "DataManager", data_id: str) -> bool:
+    """Same as convert for a packet read and written through a DataManager, e.g.
+    one that is stored in a SegmentStore"""
+    with data_manager.open_packet(data_id) as f_in:
+        raw = f_in.read()
+
+    with zipfile.ZipFile(io.BytesIO(raw), "r") as z_in:
+        if not has_legacy(z_in):
+            return False
+
+        # the packet is only replaced when it is complete
+        converted = io.BytesIO()
+        rewrite(z_in, converted)
+
+    with data_manager.open_packet(data_id, mode="w") as f_out:
+        f_out.write(converted.getvalue())
+    return True
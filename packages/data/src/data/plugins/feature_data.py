@@ -7,6 +7,7 @@ import numpy as np
 
 from ..manager import DataManager
 from ..data import Data
+from ..utils import LazyRows, load_array
 from interface import data_pb2
 
 
@@ -110,18 +111,15 @@ class FeaturesData(Data):
         assert self.check_fs(), "No filesystem handler installed"
 
         data = self.load_dict("features.yml")
-        self.features = [FeatureData(**x) for x in data.get("features")]
+        rows = data.get("features")
 
-        with self.fs.open_file("features.npz", "r") as f:
-            features = np.load(f)
-        if len(self.features) != features.shape[0]:
-            logging.error(
-                f"Data has invalid shape {len(self.features)} vs. {features.shape[0]}"
-            )
-            return
+        # the rows are mapped from the packet and turned into objects on access
+        features = load_array(self.fs, "features.npz")
+        if len(rows) != features.shape[0]:
+            logging.error(f"Data has invalid shape {len(rows)} vs. {features.shape[0]}")
+            features = None
 
-        for i in range(features.shape[0]):
-            self.features[i].embedding = features[i]
+        self.features = LazyRows(rows, features, FeatureData)
 
     def save(self) -> None:
         super().save()
@@ -7,6 +7,7 @@ import numpy as np
 
 from ..manager import DataManager
 from ..data import Data
+from ..utils import load_array
 from analyser.proto import analyser_pb2
 
 
@@ -23,11 +24,8 @@ class HistData(Data):
         data = self.load_dict("hist_data.yml")
         self.delta_time = data.get("delta_time")
 
-        with self.fs.open_file("hist.npz", "r") as f:
-            self.hist = np.load(f)
-
-        with self.fs.open_file("time.npz", "r") as f:
-            self.time = np.load(f)
+        self.hist = load_array(self.fs, "hist.npz")
+        self.time = load_array(self.fs, "time.npz")
 
     def save(self) -> None:
         super().save()
@@ -1,3 +1,4 @@
+import io
 import logging
 import yaml
 from typing import List, Union
@@ -5,6 +6,7 @@ from collections.abc import Iterator, Iterable
 
 from dataclasses import dataclass, field, fields
 import imageio.v3 as iio
+from PIL import Image
 
 import numpy.typing as npt
 import numpy as np
@@ -13,6 +15,13 @@ from ..manager import DataManager
 from ..data import Data
 from interface import data_pb2
 
+# maximum side length of the preview image, stored next to the image only if
+# requested when saving, otherwise it is created when it is first read
+THUMBNAIL_SIZE = 256
+
+# encoded images in these formats are stored as uploaded, all others are transcoded
+ENCODED_FORMATS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
 
 @DataManager.export("ImageData", data_pb2.IMAGE_DATA)
 @dataclass(kw_only=True)
@@ -21,6 +30,8 @@ class ImageData(Data):
     time: float = None
     delta_time: float = field(default=None)
     ext: str = field(default="jpg")
+    width: int = field(default=None)
+    height: int = field(default=None)
 
     def load(self) -> None:
         super().load()
@@ -30,6 +41,8 @@ class ImageData(Data):
         self.time = data.get("time")
         self.delta_time = data.get("delta_time")
         self.ext = data.get("ext")
+        self.width = data.get("width")
+        self.height = data.get("height")
 
     def save(self) -> None:
         super().save()
@@ -42,10 +55,14 @@ class ImageData(Data):
                 "time": self.time,
                 "delta_time": self.delta_time,
                 "ext": self.ext,
+                "width": self.width,
+                "height": self.height,
             },
         )
 
-    def save_image(self, image: npt.ArrayLike, **kwargs) -> None:
+    def save_image(
+        self, image: npt.ArrayLike, thumbnail: bool = False, **kwargs
+    ) -> None:
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
         try:
@@ -56,6 +73,93 @@ class ImageData(Data):
             logging.error("[ImagesData] Could not add a new image")
             return None
 
+        self.height, self.width = image.shape[:2]
+        if thumbnail:
+            self.save_thumbnail(image)
+
+    def save_encoded(
+        self, encoded: bytes, ext: str = None, thumbnail: bool = False
+    ) -> bool:
+        """Stores an encoded image without decoding and encoding it again.
+
+        Only the header is parsed to check the format and the dimensions.
+        Formats that aren't in ENCODED_FORMATS are transcoded with save_image.
+        The image is only decoded for the thumbnail if thumbnail is set.
+        """
+        assert self.check_fs(), "No filesystem handler installed"
+        assert self.fs.mode == "w", "Data packet is open read only"
+
+        try:
+            image = Image.open(io.BytesIO(encoded))
+        except Exception:
+            image = None
+
+        if image is None or image.format not in ENCODED_FORMATS:
+            try:
+                decoded = iio.imread(encoded, extension=f".{ext}" if ext else None)
+            except Exception as e:
+                logging.error(
+                    f"[ImageData] Could not decode the image (Exception: {e})"
+                )
+                return False
+
+            if ext is not None and ext.lower() in ENCODED_FORMATS.values():
+                self.ext = ext.lower()
+            else:
+                self.ext = "jpg"
+            self.save_image(decoded, thumbnail=thumbnail)
+            return self.width is not None
+
+        self.ext = ENCODED_FORMATS[image.format]
+        self.width, self.height = image.size
+        with self.fs.open_file(f"image.{self.ext}", "w") as f:
+            f.write(encoded)
+
+        if thumbnail:
+            self.save_thumbnail(image)
+        return True
+
+    def encode_thumbnail(self, image: npt.ArrayLike | Image.Image) -> bytes | None:
+        try:
+            if not isinstance(image, Image.Image):
+                image = Image.fromarray(np.asarray(image))
+            # jpeg images are decoded at a reduced scale
+            image.draft("RGB", (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            thumbnail = image.convert("RGB")
+            thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            encoded = io.BytesIO()
+            thumbnail.save(encoded, format="JPEG", quality=80)
+            return encoded.getvalue()
+        except Exception as e:
+            logging.warning(
+                f"[ImageData] Could not create a thumbnail (Exception: {e})"
+            )
+            return None
+
+    def save_thumbnail(self, image: npt.ArrayLike | Image.Image) -> None:
+        encoded = self.encode_thumbnail(image)
+        if encoded is not None:
+            with self.fs.open_file("thumbnail.jpg", "w") as f:
+                f.write(encoded)
+
+    def load_thumbnail(self) -> bytes | None:
+        assert self.check_fs(), "No filesystem handler installed"
+
+        try:
+            return self.fs.read_file("thumbnail.jpg")
+        except KeyError:
+            pass
+
+        # images saved without a thumbnail get one created from the stored image
+        try:
+            encoded = self.fs.read_file(f"image.{self.ext}")
+            return self.encode_thumbnail(Image.open(io.BytesIO(encoded)))
+        except Exception as e:
+            logging.warning(
+                f"[ImageData] Could not create a thumbnail (Exception: {e})"
+            )
+            return None
+
     def load_image(self) -> npt.ArrayLike:
         assert self.check_fs(), "No filesystem handler installed"
 
@@ -72,13 +176,26 @@ class ImageData(Data):
             "time": self.time,
             "delta_time": self.delta_time,
             "ext": self.ext,
+            "width": self.width,
+            "height": self.height,
         }
 
-    def to_proto(self) -> data_pb2.Data:
-        with self.fs.open_file(f"image.{self.ext}", "r") as f:
-            return data_pb2.Data(
-                id=self.id, image=data_pb2.ImageData(content=f.read(), ext=self.ext)
-            )
+    def to_proto(
+        self, include_media: bool = True, include_thumbnail: bool = False
+    ) -> data_pb2.Data:
+        image = data_pb2.ImageData(
+            ext=self.ext, width=self.width or 0, height=self.height or 0
+        )
+
+        # without media the image is only referenced by its id
+        if include_media:
+            image.content = self.fs.read_file(f"image.{self.ext}")
+        elif include_thumbnail:
+            thumbnail = self.load_thumbnail()
+            if thumbnail is not None:
+                image.thumbnail = thumbnail
+
+        return data_pb2.Data(id=self.id, image=image)
 
 
 @DataManager.export("ImagesData", data_pb2.IMAGES_DATA)
@@ -19,6 +19,9 @@ class ListData(Data):
     type: str = field(default="ListData")
     data: List[str] = field(default_factory=list)
     index: List[Union[str, int]] = field(default_factory=list)
+    # type of each entry in data, so the entries can be loaded without reading
+    # their meta.yml first
+    types: List[str] = field(default_factory=list)
 
     def load(self) -> None:
         super().load()
@@ -27,13 +30,18 @@ class ListData(Data):
         data = self.load_dict("list_data.yml")
         self.index = data.get("index")
         self.data = data.get("data")
+        # missing in lists written by older versions
+        self.types = data.get("types", [])
 
     def save(self) -> None:
         super().save()
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        self.save_dict("list_data.yml", {"index": self.index, "data": self.data})
+        self.save_dict(
+            "list_data.yml",
+            {"index": self.index, "data": self.data, "types": self.types},
+        )
 
     def create_data(
         self, data_type: str, index: str = None, data_id: str = None
@@ -48,6 +56,7 @@ class ListData(Data):
         data._register_fs_handler(LocalFSHandler(self.fs, data.id))
 
         self.data.append(data.id)
+        self.types.append(data.type)
         if index is None:
             index = len(self.index)
         self.index.append(index)
@@ -70,6 +79,7 @@ class ListData(Data):
                         f_out.write(chunk)
 
         self.data.append(data.id)
+        self.types.append(data.type)
         if index is None:
             index = len(self.index)
         self.index.append(index)
@@ -78,28 +88,36 @@ class ListData(Data):
         return len(self.index)
 
     def __iter__(self):
-        for i, data_id in zip(self.index, self.data):
-            data = Data()
-            data._register_fs_handler(LocalFSHandler(self.fs, data_id))
-            data_type = None
-            with data:
-                data_type = data.type
+        types = self.types if len(self.types) == len(self.data) else None
+        for j, (i, data_id) in enumerate(zip(self.index, self.data)):
+            if types is not None:
+                data_type = types[j]
+            else:
+                data_type = self.read_type(data_id)
 
             assert (
                 data_type in DataManager._data_name_lut
             ), f"Unknown data type {data_type}"
 
-            data = DataManager._data_name_lut[data_type]()
+            data = DataManager._data_name_lut[data_type](id=data_id)
             data._register_fs_handler(LocalFSHandler(self.fs, data_id))
 
             yield i, data
 
+    def read_type(self, data_id: str) -> str:
+        data = Data()
+        data._register_fs_handler(LocalFSHandler(self.fs, data_id))
+        with data:
+            return data.type
+
     def extract_all(self, data_manager: DataManager) -> None:
 
         for i, data in self:
             with data:
-                output_path = data_manager._create_data_path(data.id)
-                with zipfile.ZipFile(output_path, "w") as z:
+                with (
+                    data_manager.open_packet(data.id, mode="w") as f,
+                    zipfile.ZipFile(f, "w") as z,
+                ):
                     for file in data.fs.list_files():
                         logging.info(f"Extract {file}")
                         with (
@@ -7,6 +7,7 @@ import numpy as np
 
 from ..manager import DataManager
 from ..data import Data
+from ..utils import load_array
 from analyser.proto import analyser_pb2
 
 
@@ -23,11 +24,8 @@ class RGBData(Data):
         data = self.load_dict("rgb_data.yml")
         self.delta_time = data.get("delta_time")
 
-        with self.fs.open_file("colors.npz", "r") as f:
-            self.colors = np.load(f)
-
-        with self.fs.open_file("time.npz", "r") as f:
-            self.time = np.load(f)
+        self.colors = load_array(self.fs, "colors.npz")
+        self.time = load_array(self.fs, "time.npz")
 
     def save(self) -> None:
         super().save()
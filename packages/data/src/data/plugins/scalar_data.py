@@ -7,6 +7,7 @@ import numpy as np
 
 from ..manager import DataManager
 from ..data import Data
+from ..utils import load_array
 from analyser.proto import analyser_pb2
 
 
@@ -25,11 +26,8 @@ class ScalarData(Data):
         data = self.load_dict("scalar_data.yml")
         self.delta_time = data.get("delta_time")
 
-        with self.fs.open_file("y.npz", "r") as f:
-            self.y = np.load(f)
-
-        with self.fs.open_file("time.npz", "r") as f:
-            self.time = np.load(f)
+        self.y = load_array(self.fs, "y.npz")
+        self.time = load_array(self.fs, "time.npz")
 
     def save(self) -> None:
         super().save()
@@ -7,6 +7,7 @@ import numpy as np
 
 from ..manager import DataManager
 from ..data import Data
+from ..utils import LazyRows, load_array
 from analyser.proto import analyser_pb2
 
 
@@ -45,16 +46,15 @@ class TextEmbeddings(Data):
         assert self.check_fs(), "No filesystem handler installed"
 
         data = self.load_dict("text_embeddings_data.yml")
-        self.embeddings = [TextEmbedding(**x) for x in data.get("embeddings")]
+        rows = data.get("embeddings")
 
-        with self.fs.open_file("embeddings.npz", "r") as f:
-            embeddings = np.load(f)
-        if len(self.embeddings) != embeddings.shape[0]:
-            logging.error(f"Data has invalid shape {len(self.embeddings)} vs. {embeddings.shape[0]}")
-            return
+        # the rows are mapped from the packet and turned into objects on access
+        embeddings = load_array(self.fs, "embeddings.npz")
+        if len(rows) != embeddings.shape[0]:
+            logging.error(f"Data has invalid shape {len(rows)} vs. {embeddings.shape[0]}")
+            embeddings = None
 
-        for i in range(embeddings.shape[0]):
-            self.embeddings[i].embedding = embeddings[i]
+        self.embeddings = LazyRows(rows, embeddings, TextEmbedding)
 
     def save(self) -> None:
         super().save()
@@ -0,0 +1,277 @@
+import io
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Tuple
+
+default_config = {
+    "segment_mb": 1024,
+    # segments are rewritten if at least this part of them belongs to deleted packets,
+    # the active segment is closed first, so small stores reclaim space as well
+    "compact_ratio": 0.5,
+}
+
+
+class SegmentSlice(io.RawIOBase):
+    """Read only file object for a packet inside a segment file"""
+
+    def __init__(self, path: str, offset: int, length: int):
+        self.file = open(path, "rb")
+        self.offset = offset
+        self.length = length
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, position: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            position += self.position
+        elif whence == io.SEEK_END:
+            position += self.length
+        self.position = min(max(position, 0), self.length)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.length - self.position)
+        if size <= 0:
+            return 0
+
+        self.file.seek(self.offset + self.position)
+        size = self.file.readinto(memoryview(buffer)[:size])
+        self.position += size
+        return size
+
+    def close(self) -> None:
+        self.file.close()
+        super().close()
+
+
+class SegmentWriter(io.BytesIO):
+    """Collects a packet in memory, it is appended to the store when closed"""
+
+    def __init__(self, store: "SegmentStore", data_id: str):
+        super().__init__()
+        self.store = store
+        self.data_id = data_id
+
+    def close(self) -> None:
+        if not self.closed:
+            self.store.put(self.data_id, self.getvalue())
+        super().close()
+
+
+class SegmentStore:
+    """Stores packets appended to a few large segment files instead of one file each.
+
+    The location of every packet is kept in an sqlite index next to the segments.
+    Replaced and deleted packets leave their bytes in the segments until `compact`
+    copies the remaining packets of a segment into the active one. An active
+    segment with many dead bytes is rolled over to a new one first. Only one
+    process may write to a store.
+    """
+
+    def __init__(self, path: str, config: Dict = None):
+        self.config = {**default_config, **(config or {})}
+        self.segment_size = self.config.get("segment_mb") * 1024 * 1024
+        self.compact_ratio = self.config.get("compact_ratio")
+
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.index = sqlite3.connect(
+            os.path.join(self.path, "index.sqlite"), check_same_thread=False
+        )
+        self.index.execute("PRAGMA journal_mode=WAL")
+        self.index.execute("PRAGMA synchronous=NORMAL")
+        self.index.execute(
+            "CREATE TABLE IF NOT EXISTS packets "
+            "(id TEXT PRIMARY KEY, segment INTEGER, offset INTEGER, length INTEGER)"
+        )
+        self.index.execute(
+            "CREATE TABLE IF NOT EXISTS segments "
+            "(id INTEGER PRIMARY KEY, size INTEGER, dead INTEGER)"
+        )
+        self.index.commit()
+
+        row = self.index.execute("SELECT MAX(id) FROM segments").fetchone()
+        self.active_segment = None
+        self.active_file = None
+        self.open_segment(row[0] if row[0] is not None else 0)
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{segment:06d}.seg")
+
+    def open_segment(self, segment: int) -> None:
+        # has to be called with the lock held or during init
+        if self.active_file is not None:
+            self.active_file.close()
+
+        self.active_segment = segment
+        self.active_file = open(self.segment_path(segment), "ab")
+        self.index.execute(
+            "INSERT OR IGNORE INTO segments (id, size, dead) VALUES (?, ?, 0)",
+            (segment, self.active_file.tell()),
+        )
+        self.index.commit()
+
+    def append(self, data_id: str, raw: bytes) -> None:
+        # has to be called with the lock held, the index is committed by the caller
+        if self.active_file.tell() + len(raw) > self.segment_size > 0:
+            if self.active_file.tell() > 0:
+                self.open_segment(self.active_segment + 1)
+
+        # the data is written before the index, a crash only leaves unused bytes
+        offset = self.active_file.tell()
+        self.active_file.write(raw)
+        self.active_file.flush()
+
+        self.release(data_id)
+        self.index.execute(
+            "INSERT INTO packets (id, segment, offset, length) VALUES (?, ?, ?, ?)",
+            (data_id, self.active_segment, offset, len(raw)),
+        )
+        self.index.execute(
+            "UPDATE segments SET size = ? WHERE id = ?",
+            (self.active_file.tell(), self.active_segment),
+        )
+
+    def release(self, data_id: str) -> bool:
+        # has to be called with the lock held, marks the bytes of a packet as dead
+        row = self.index.execute(
+            "SELECT segment, length FROM packets WHERE id = ?", (data_id,)
+        ).fetchone()
+        if row is None:
+            return False
+
+        self.index.execute("DELETE FROM packets WHERE id = ?", (data_id,))
+        self.index.execute(
+            "UPDATE segments SET dead = dead + ? WHERE id = ?", (row[1], row[0])
+        )
+        return True
+
+    def put(self, data_id: str, raw: bytes) -> None:
+        with self.lock:
+            self.append(data_id, raw)
+            self.index.commit()
+
+    def get(self, data_id: str) -> Tuple[int, int, int] | None:
+        """Returns the segment, offset and length of a packet"""
+        with self.lock:
+            return self.index.execute(
+                "SELECT segment, offset, length FROM packets WHERE id = ?", (data_id,)
+            ).fetchone()
+
+    def __contains__(self, data_id: str) -> bool:
+        return self.get(data_id) is not None
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.index.execute("SELECT COUNT(*) FROM packets").fetchone()[0]
+
+    def ids(self) -> List[str]:
+        with self.lock:
+            return [x[0] for x in self.index.execute("SELECT id FROM packets")]
+
+    def delete(self, data_id: str) -> bool:
+        with self.lock:
+            deleted = self.release(data_id)
+            self.index.commit()
+        return deleted
+
+    def open(self, data_id: str) -> SegmentSlice | None:
+        # a segment might be removed by a compaction between the lookup and the open
+        for _ in range(2):
+            location = self.get(data_id)
+            if location is None:
+                return None
+
+            segment, offset, length = location
+            try:
+                return SegmentSlice(self.segment_path(segment), offset, length)
+            except FileNotFoundError:
+                continue
+        return None
+
+    def writer(self, data_id: str) -> SegmentWriter:
+        return SegmentWriter(self, data_id)
+
+    def compact(self) -> int:
+        """Rewrites segments with many dead bytes, returns the number of freed bytes"""
+        with self.lock:
+            size, dead = self.index.execute(
+                "SELECT size, dead FROM segments WHERE id = ?", (self.active_segment,)
+            ).fetchone()
+            # a store below segment_mb only has the active segment
+            if dead > 0 and dead >= size * self.compact_ratio:
+                self.open_segment(self.active_segment + 1)
+
+            segments = self.index.execute(
+                "SELECT id, size, dead FROM segments WHERE id != ? AND dead >= size * ?",
+                (self.active_segment, self.compact_ratio),
+            ).fetchall()
+
+        num_bytes = 0
+        for segment, size, dead in segments:
+            path = self.segment_path(segment)
+            with self.lock:
+                packets = self.index.execute(
+                    "SELECT id, offset, length FROM packets WHERE segment = ?",
+                    (segment,),
+                ).fetchall()
+
+            # the live packets are copied one by one to the active segment, packets
+            # that are replaced or deleted in the meantime are skipped
+            num_moved = 0
+            moved_bytes = 0
+            with open(path, "rb") as f:
+                for data_id, offset, length in packets:
+                    f.seek(offset)
+                    raw = f.read(length)
+                    with self.lock:
+                        location = self.index.execute(
+                            "SELECT segment, offset FROM packets WHERE id = ?",
+                            (data_id,),
+                        ).fetchone()
+                        if location == (segment, offset):
+                            self.append(data_id, raw)
+                            self.index.commit()
+                            num_moved += 1
+                            moved_bytes += length
+
+            with self.lock:
+                self.index.execute("DELETE FROM segments WHERE id = ?", (segment,))
+                self.index.commit()
+
+            os.remove(path)
+            num_bytes += size - moved_bytes
+            logging.info(
+                f"[SegmentStore::compact] Segment {segment}: {num_moved} packets moved"
+            )
+
+        return num_bytes
+
+    def stats(self) -> Dict:
+        with self.lock:
+            num_segments, size, dead = self.index.execute(
+                "SELECT COUNT(*), SUM(size), SUM(dead) FROM segments"
+            ).fetchone()
+        return {
+            "num_packets": len(self),
+            "num_segments": num_segments,
+            "num_bytes": size or 0,
+            "num_dead_bytes": dead or 0,
+        }
+
+    def close(self) -> None:
+        with self.lock:
+            self.active_file.close()
+            self.index.close()
@@ -1,21 +1,92 @@
+import io
 import os
 import uuid
 import logging
-import imageio.v3 as iio
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import numpy.typing as npt
+
+
+def data_path(data_dir, data_id, file_ext):
+    return os.path.join(data_dir, data_id[0:2], data_id[2:4], f"{data_id}.{file_ext}")
 
 
 def create_data_path(data_dir, data_id, file_ext):
     os.makedirs(os.path.join(data_dir, data_id[0:2], data_id[2:4]), exist_ok=True)
-    data_path = os.path.join(
-        data_dir, data_id[0:2], data_id[2:4], f"{data_id}.{file_ext}"
-    )
-    return data_path
+    return data_path(data_dir, data_id, file_ext)
 
 
 def generate_id():
     return uuid.uuid4().hex
 
 
+def load_array(fs, filename: str) -> npt.NDArray:
+    """Loads a .npy file, uncompressed files are mapped read only from the packet"""
+    view = fs.map_file(filename)
+    if view is not None:
+        try:
+            # the header is parsed from a copy of its first bytes only
+            header = io.BytesIO(view[: 1 << 16])
+            version = np.lib.format.read_magic(header)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(
+                    header
+                )
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(
+                    header
+                )
+
+            if not dtype.hasobject:
+                return np.frombuffer(
+                    view,
+                    dtype=dtype,
+                    count=int(np.prod(shape)),
+                    offset=header.tell(),
+                ).reshape(shape, order="F" if fortran_order else "C")
+        except ValueError as e:
+            logging.warning(f"[load_array] Could not map {filename}: {repr(e)}")
+
+    with fs.open_file(filename, "r") as f:
+        return np.load(f)
+
+
+class LazyRows(Sequence):
+    """Objects for the rows of an array, created only when they are accessed
+
+    `array` is the (mapped) array itself, e.g. to read a range of rows at once.
+    """
+
+    def __init__(
+        self, rows: List[Dict], array: npt.NDArray | None, factory: Callable
+    ) -> None:
+        self.rows = rows
+        self.array = array
+        self.factory = factory
+        self.objects = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+
+        if index not in self.objects:
+            row = self.rows[index]
+            if self.array is not None:
+                row = {**row, "embedding": self.array[index]}
+            self.objects[index] = self.factory(**row)
+        return self.objects[index]
+
+
 def convert_proto_data_to_datamanager(data_manager, data):
 
     with data_manager.create_data("ListData") as points_list:
@@ -31,10 +102,7 @@ def convert_proto_data_to_datamanager(data_manager, data):
 
                 if data_type == "image":
                     with list_data.create_data("ImageData", data.name) as image_data:
-                        image_data.ext = data.image.ext
-
-                        image = iio.imread(data.image.content)
-                        image_data.save_image(image)
+                        image_data.save_encoded(data.image.content, ext=data.image.ext)
 
                 elif data_type == "bool":
                     with list_data.create_data("BoolData", data.name) as bool_data:
@@ -50,6 +50,12 @@ class SearcherStub(object):
             response_deserializer=searcher__pb2.ListSearchResultReply.FromString,
             _registered_method=True,
         )
+        self.search_stream = channel.unary_stream(
+            "/fileharbor.Searcher/search_stream",
+            request_serializer=searcher__pb2.SearchRequest.SerializeToString,
+            response_deserializer=searcher__pb2.SearchStreamReply.FromString,
+            _registered_method=True,
+        )
 
 
 class SearcherServicer(object):
@@ -67,6 +73,12 @@ class SearcherServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def search_stream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_SearcherServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -80,6 +92,11 @@ def add_SearcherServicer_to_server(servicer, server):
             request_deserializer=searcher__pb2.ListSearchResultRequest.FromString,
             response_serializer=searcher__pb2.ListSearchResultReply.SerializeToString,
         ),
+        "search_stream": grpc.unary_stream_rpc_method_handler(
+            servicer.search_stream,
+            request_deserializer=searcher__pb2.SearchRequest.FromString,
+            response_serializer=searcher__pb2.SearchStreamReply.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "fileharbor.Searcher", rpc_method_handlers
@@ -151,3 +168,33 @@ class Searcher(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def search_stream(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/fileharbor.Searcher/search_stream",
+            searcher__pb2.SearchRequest.SerializeToString,
+            searcher__pb2.SearchStreamReply.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )